@@ -0,0 +1,158 @@
+"""
+RSS解析基准测试
+比较feedparser完整解析与流式快速解析的耗时、峰值内存和输出一致性
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.synthetic import make_atom, make_rss
+from src.feeds.parser import parse_feed
+
+
+def measure(func: Callable[[], object], rounds: int) -> Dict[str, float]:
+    """多次运行取耗时中位数，并单独测量一次峰值内存"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "peak_kb": peak / 1024
+    }
+
+
+def comparable(entries: List[tuple]) -> List[tuple]:
+    """去掉发布时间戳中无法比较的部分（无日期时为当前时间）"""
+    return [entry[:5] + (round(entry[5]),) for entry in entries]
+
+
+# 快速路径需要与feedparser保持一致的边界情况（不计时，只检查输出）
+_DC = 'xmlns:dc="http://purl.org/dc/elements/1.1/"'
+EDGE_CASES = {
+    # 只有Dublin Core标题、描述和日期（dc:date在feedparser中是updated，不作为发布时间）
+    "dc_only": f"""<?xml version="1.0"?><rss version="2.0" {_DC}><channel><item>
+<dc:title>DC标题</dc:title><dc:description>DC &lt;b&gt;摘要&lt;/b&gt;</dc:description>
+<dc:date>2024-01-02T03:04:05Z</dc:date><link>http://example.com/1</link></item></channel></rss>""",
+    # 同时存在时标题和摘要取第一次出现的值
+    "dc_first": f"""<?xml version="1.0"?><rss version="2.0" {_DC}><channel><item>
+<dc:title>DC标题</dc:title><title>标题</title><dc:description>DC摘要</dc:description>
+<description>摘要</description><link>http://example.com/1</link></item></channel></rss>""",
+    "rss_first": f"""<?xml version="1.0"?><rss version="2.0" {_DC}><channel><item>
+<title>标题</title><dc:title>DC标题</dc:title><description>摘要</description>
+<dc:description>DC摘要</dc:description><link>http://example.com/1</link></item></channel></rss>""",
+    # 重复元素：标题、摘要、正文取第一次，链接、guid、发布时间取最后一次
+    "duplicates": """<?xml version="1.0"?><rss version="2.0"
+xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><item>
+<title>A</title><title>B</title><description>X</description><description>Y</description>
+<content:encoded>C1</content:encoded><content:encoded>C2</content:encoded>
+<link>http://example.com/1</link><link>http://example.com/2</link><guid>g1</guid><guid>g2</guid>
+<pubDate>Tue, 02 Jan 2024 03:04:05 GMT</pubDate><pubDate>Wed, 03 Jan 2024 03:04:05 GMT</pubDate>
+</item></channel></rss>""",
+    # Atom条目中的Dublin Core字段回退到feedparser
+    "atom_dc": f"""<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom" {_DC}><entry>
+<dc:title>DC标题</dc:title><id>http://example.com/1</id><link href="http://example.com/1"/>
+</entry></feed>""",
+    # RSS条目中只有atom:link链接，交给feedparser处理
+    "atom_link": """<?xml version="1.0"?><rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>
+<item><title>标题</title><atom:link href="http://example.com/1"/><guid isPermaLink="false">g1</guid></item>
+</channel></rss>""",
+    # 只有itunes:summary摘要，交给feedparser处理
+    "itunes_summary": """<?xml version="1.0"?><rss version="2.0"
+xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"><channel><item>
+<title>标题</title><itunes:summary>播客摘要</itunes:summary><link>http://example.com/1</link></item>
+</channel></rss>""",
+    # media:content中嵌套的media:title会成为标题，交给feedparser处理
+    "media_title": """<?xml version="1.0"?><rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>
+<item><media:content url="http://example.com/1.jpg"><media:title>媒体标题</media:title></media:content>
+<link>http://example.com/1</link></item></channel></rss>""",
+    # 不影响所提取字段的常见命名空间元素，仍走快速路径
+    "ignored_ns": f"""<?xml version="1.0"?><rss version="2.0" {_DC}
+xmlns:media="http://search.yahoo.com/mrss/" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"
+xmlns:slash="http://purl.org/rss/1.0/modules/slash/" xmlns:wfw="http://wellformedweb.org/CommentAPI/"><channel>
+<item><title>标题</title><link>http://example.com/1</link><description>摘要</description>
+<dc:creator>作者</dc:creator><media:thumbnail url="http://example.com/1.jpg"/>
+<media:content url="http://example.com/1.mp4"><media:credit>来源</media:credit></media:content>
+<itunes:duration>10:00</itunes:duration><itunes:subtitle>副标题</itunes:subtitle><itunes:author>作者</itunes:author>
+<slash:comments>3</slash:comments><wfw:commentRss>http://example.com/1/feed</wfw:commentRss>
+<pubDate>Tue, 02 Jan 2024 03:04:05 GMT</pubDate></item></channel></rss>""",
+}
+
+# 必须由快速路径完成的边界用例（其余用例回退到feedparser也视为一致）
+FAST_PATH_CASES = {"dc_only", "dc_first", "rss_first", "duplicates", "ignored_ns"}
+
+
+def check_edge_cases(max_articles: int) -> bool:
+    """检查边界情况的输出一致性，返回是否全部一致"""
+    consistent = True
+    for name, text in EDGE_CASES.items():
+        content = text.encode("utf-8")
+        full = parse_feed(content, {}, max_articles, fast_path=False)
+        fast = parse_feed(content, {}, max_articles, fast_path=True)
+        same = comparable(full.entries) == comparable(fast.entries) \
+            and (fast.fast_path or name not in FAST_PATH_CASES)
+        consistent = consistent and same
+        print(f"边界用例 {name:<14} {'快速路径' if fast.fast_path else '回退完整解析'}  一致: {'是' if same else '否'}")
+    return consistent
+
+
+def run(items: int, body_size: int, max_articles: int, rounds: int) -> bool:
+    """运行全部用例，返回输出是否一致"""
+    cases = {
+        "rss": make_rss(items, body_size),
+        "atom": make_atom(items, body_size),
+    }
+
+    print(f"条目数={items} 正文大小={body_size}B max_articles={max_articles} 轮数={rounds}")
+    print(f"{'用例':<8}{'文档大小':>10}{'feedparser(ms)':>16}{'快速路径(ms)':>14}{'加速比':>8}"
+          f"{'feedparser峰值(KB)':>20}{'快速路径峰值(KB)':>18}  一致")
+
+    consistent = True
+    for name, content in cases.items():
+        full = parse_feed(content, {}, max_articles, fast_path=False)
+        fast = parse_feed(content, {}, max_articles, fast_path=True)
+        same = fast.fast_path and comparable(full.entries) == comparable(fast.entries) \
+            and full.poll_hint == fast.poll_hint
+        consistent = consistent and same
+
+        slow_stats = measure(lambda: parse_feed(content, {}, max_articles, fast_path=False), rounds)
+        fast_stats = measure(lambda: parse_feed(content, {}, max_articles, fast_path=True), rounds)
+        print(f"{name:<8}{len(content) // 1024:>8}KB"
+              f"{slow_stats['median_ms']:>16.1f}{fast_stats['median_ms']:>14.1f}"
+              f"{slow_stats['median_ms'] / fast_stats['median_ms']:>7.1f}x"
+              f"{slow_stats['peak_kb']:>20.0f}{fast_stats['peak_kb']:>18.0f}  {'是' if same else '否'}")
+
+    return check_edge_cases(max_articles) and consistent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS解析基准测试")
+    parser.add_argument("--items", type=int, default=300, help="每个文档的条目数")
+    parser.add_argument("--body-size", type=int, default=4096, help="每个条目的正文字节数")
+    parser.add_argument("--max-articles", type=int, default=20, help="解析的最大条目数")
+    parser.add_argument("--rounds", type=int, default=5, help="每个用例的运行轮数")
+    args = parser.parse_args()
+
+    if not run(args.items, args.body_size, args.max_articles, args.rounds):
+        print("快速路径与feedparser的输出不一致")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+基准结果对比
+比较两次run_suite.py结果文件中各用例的延迟和吞吐量变化
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def load(path: str) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def change(before: float, after: float) -> str:
+    if not before:
+        return "-"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="基准结果对比")
+    parser.add_argument("baseline", help="基准结果文件")
+    parser.add_argument("candidate", help="对比结果文件")
+    parser.add_argument("--threshold", type=float, default=0.0,
+                        help="p95延迟增幅超过该百分比时以非零状态退出，0表示不检查")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    print(f"基准: {baseline['meta'].get('commit')}  对比: {candidate['meta'].get('commit')}")
+    print(f"{'用例':<32}{'p50(ms)':>20}{'p95(ms)':>20}{'吞吐(次/秒)':>22}")
+
+    regressions = []
+    for name, after in candidate["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        print(f"{name:<34}"
+              f"{before['p50_ms']:>9.3f}→{after['p50_ms']:<9.3f}"
+              f"{before['p95_ms']:>9.3f}→{after['p95_ms']:<9.3f}"
+              f"{change(before['ops_per_sec'], after['ops_per_sec']):>12}")
+        if args.threshold and before["p95_ms"] and \
+                (after["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 > args.threshold:
+            regressions.append(name)
+
+    print(f"峰值内存: {baseline['peak_rss_kb'] / 1024:.1f} MB → {candidate['peak_rss_kb'] / 1024:.1f} MB")
+    if regressions:
+        print(f"p95延迟增幅超过 {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+离线基准测试套件
+对本地合成RSS源测量抓取、并发获取、搜索、缓存和工具调用的延迟分布与吞吐量，结果写入JSON文件
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import inspect
+import json
+import logging
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mcp.server.fastmcp import FastMCP
+
+from benchmarks.synthetic import VOCABULARY, FeedServerConfig, SyntheticFeedServer
+from src.config.settings import AppConfig, ConfigLoader, FeedSource
+from src.feeds.cache import FeedCache, init_cache
+from src.feeds.fetcher import get_fetcher, init_fetcher
+from src.feeds.health import init_health_tracker
+from src.feeds.manager import FeedManager
+from src.feeds.parser import get_parser, init_parser
+from src.server import create_server
+from src.tools.manager import ToolManager
+
+
+SCENARIOS = ["cache", "fetch_feed", "fan_out", "search", "tools", "failing_feed"]
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """线性插值百分位数，samples须已排序"""
+    if not samples:
+        return 0.0
+    position = (len(samples) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+
+def peak_rss_kb() -> float:
+    """进程至今的峰值常驻内存（KB）"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS返回字节，Linux返回KB
+    return peak / 1024 if sys.platform == "darwin" else float(peak)
+
+
+class Recorder:
+    """收集各用例的单次耗时并汇总"""
+
+    def __init__(self):
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.failures: List[str] = []  # 未通过的行为检查
+
+    async def run(self, name: str, func: Callable[[], Any], iterations: int,
+                  **extra: Any) -> None:
+        """
+        依次运行func并记录每次耗时
+
+        Args:
+            name: 用例名称
+            func: 被测函数，返回可等待对象时等待其完成
+            iterations: 运行次数
+            **extra: 附加到结果中的信息
+        """
+        samples = []
+        wall_start = time.perf_counter()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            result = func()
+            if inspect.isawaitable(result):
+                await result
+            samples.append(time.perf_counter() - start)
+        self.add(name, samples, time.perf_counter() - wall_start, **extra)
+
+    def add(self, name: str, samples: List[float], wall: float, **extra: Any) -> None:
+        """汇总一组耗时（秒）"""
+        ordered = sorted(samples)
+        self.results[name] = {
+            "count": len(ordered),
+            "p50_ms": percentile(ordered, 0.50) * 1000,
+            "p95_ms": percentile(ordered, 0.95) * 1000,
+            "p99_ms": percentile(ordered, 0.99) * 1000,
+            "mean_ms": sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+            "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+            "ops_per_sec": len(ordered) / wall if wall > 0 else 0.0,
+            "peak_rss_kb": peak_rss_kb(),
+            **extra
+        }
+        print(f"{name:<34}{len(ordered):>7}{self.results[name]['p50_ms']:>10.3f}"
+              f"{self.results[name]['p95_ms']:>10.3f}{self.results[name]['p99_ms']:>10.3f}"
+              f"{self.results[name]['ops_per_sec']:>12.1f}")
+
+
+def make_config(urls: List[str], args: argparse.Namespace) -> AppConfig:
+    """以项目配置为基础，将RSS源替换为合成源并关闭磁盘缓存和后台刷新"""
+    config = ConfigLoader(str(project_root / "config")).load_config()
+    config.feeds.categories = {
+        "bench": [FeedSource(f"bench-{i}", url, "合成RSS源") for i, url in enumerate(urls)]
+    }
+    config.feeds.max_articles = args.items
+    config.cache.persistent_path = ""
+    config.cache.response_cache_size = 0 if args.no_response_cache else config.cache.response_cache_size
+    config.refresh.enabled = False
+    config.tools.enabled = []
+    return config
+
+
+async def fresh_manager(config: AppConfig, **cache_overrides: Any) -> FeedManager:
+    """按create_server的顺序重建全局组件，返回没有任何缓存的RSS源管理器"""
+    await get_fetcher().close()
+    get_parser().close()
+
+    cache = dataclasses.replace(config.cache, **cache_overrides)
+    init_cache(
+        default_ttl=cache.duration,
+        max_size=cache.max_size,
+        stale_while_revalidate=cache.stale_while_revalidate,
+        stale_if_error=cache.stale_if_error,
+        max_bytes=cache.max_bytes,
+        persistent_path=cache.persistent_path
+    )
+    init_fetcher(
+        timeout=config.limits.request_timeout,
+        max_concurrent=config.limits.max_concurrent_fetches,
+        max_per_host=config.limits.max_fetches_per_host
+    )
+    init_health_tracker(
+        failure_threshold=config.health.failure_threshold,
+        base_backoff=config.health.base_backoff,
+        max_backoff=config.health.max_backoff
+    )
+    parser = init_parser(
+        mode=config.parsing.mode,
+        workers=config.parsing.workers,
+        fast_path=config.parsing.fast_path
+    )
+    await parser.start()
+    return FeedManager(dataclasses.replace(config.feeds, cache_duration=cache.duration))
+
+
+async def bench_cache(recorder: Recorder, config: AppConfig, args: argparse.Namespace) -> None:
+    """缓存读写吞吐量"""
+    cache = FeedCache(default_ttl=300, max_size=args.cache_keys)
+    value = [{"title": f"t{i}", "summary": "x" * 200} for i in range(20)]
+    keys = [f"feed:{i}" for i in range(args.cache_keys)]
+    operations = args.iterations * 100
+
+    samples = []
+    wall_start = time.perf_counter()
+    for i in range(operations):
+        start = time.perf_counter()
+        await cache.set(keys[i % len(keys)], value)
+        samples.append(time.perf_counter() - start)
+    recorder.add("cache_set", samples, time.perf_counter() - wall_start)
+
+    samples = []
+    wall_start = time.perf_counter()
+    for i in range(operations):
+        start = time.perf_counter()
+        await cache.get(keys[i % len(keys)])
+        samples.append(time.perf_counter() - start)
+    recorder.add("cache_get", samples, time.perf_counter() - wall_start)
+
+
+async def bench_fetch_feed(recorder: Recorder, config: AppConfig, args: argparse.Namespace) -> None:
+    """单个RSS源的冷启动、缓存命中和条件请求（304）"""
+    feeds = config.feeds.categories["bench"]
+
+    manager = await fresh_manager(config)
+    samples = []
+    wall_start = time.perf_counter()
+    for feed in feeds:
+        start = time.perf_counter()
+        await manager.fetch_feed(feed)
+        samples.append(time.perf_counter() - start)
+    recorder.add("fetch_feed_cold", samples, time.perf_counter() - wall_start)
+
+    rounds = iter(range(args.iterations * len(feeds)))
+    await recorder.run(
+        "fetch_feed_warm",
+        lambda: manager.fetch_feed(feeds[next(rounds) % len(feeds)]),
+        args.iterations * len(feeds)
+    )
+
+    # 缓存立即过期但保留校验值，每次调用都发送条件请求
+    manager = await fresh_manager(config, duration=0, stale_while_revalidate=0)
+    await manager.fetch_many(feeds)
+    rounds = iter(range(args.iterations * len(feeds)))
+    await recorder.run(
+        "fetch_feed_conditional",
+        lambda: manager.fetch_feed(feeds[next(rounds) % len(feeds)]),
+        args.iterations * len(feeds)
+    )
+
+
+async def bench_fan_out(recorder: Recorder, config: AppConfig, args: argparse.Namespace) -> None:
+    """全部RSS源的并发获取"""
+    limit = config.feeds.default_limit
+    samples = []
+    wall_start = time.perf_counter()
+    for _ in range(args.cold_iterations):
+        manager = await fresh_manager(config)
+        start = time.perf_counter()
+        await manager.fetch_all_feeds(limit)
+        samples.append(time.perf_counter() - start)
+    recorder.add("fetch_all_feeds_cold", samples, time.perf_counter() - wall_start,
+                 feeds=len(config.feeds.categories["bench"]))
+
+    await recorder.run("fetch_all_feeds_warm", lambda: manager.fetch_all_feeds(limit), args.iterations)
+    await recorder.run("fetch_all_feeds_balanced_warm",
+                       lambda: manager.fetch_all_feeds_balanced(limit), args.iterations)
+
+
+async def bench_search(recorder: Recorder, config: AppConfig, args: argparse.Namespace) -> None:
+    """倒排索引搜索"""
+    manager = await fresh_manager(config)
+    await manager.load_all_feeds()
+    articles = manager.get_store_stats()["articles"]
+
+    queries = VOCABULARY + [f"{a} {b}" for a, b in zip(VOCABULARY, VOCABULARY[1:])] + ['"Article 1-1"']
+    rounds = iter(range(args.iterations * len(queries)))
+    await recorder.run(
+        "search_articles",
+        lambda: manager.search_articles(queries[next(rounds) % len(queries)], 10),
+        args.iterations * len(queries),
+        articles=articles
+    )
+
+
+async def bench_tools(recorder: Recorder, config: AppConfig, args: argparse.Namespace) -> None:
+    """通过FastMCP调用工具的端到端耗时（含参数校验和响应编码）"""
+    await get_fetcher().close()
+    get_parser().close()
+    mcp = create_server(config)
+    await get_parser().start()
+
+    calls = [
+        ("health_check", {}),
+        ("list_available_feeds", {}),
+        ("get_latest_news", {"limit": 20}),
+        ("get_latest_news_seeded", {"limit": 20, "seed": 1}),
+        ("search_news", {"query": VOCABULARY[0], "limit": 10}),
+        ("get_feed_content", {"feed_name": "bench-0", "limit": 10}),
+    ]
+    for name, arguments in calls:
+        tool = name.replace("_seeded", "")
+        start = time.perf_counter()
+        await mcp.call_tool(tool, arguments)
+        recorder.add(f"tool:{name}_first", [time.perf_counter() - start], time.perf_counter() - start)
+        await recorder.run(f"tool:{name}", lambda: mcp.call_tool(tool, arguments), args.iterations)
+
+
+async def bench_failing_feed(recorder: Recorder, config: AppConfig, args: argparse.Namespace) -> None:
+    """有一个RSS源持续失败（404）时的工具调用，检查工具响应缓存仍能命中"""
+    feeds = config.feeds.categories["bench"]
+    missing = FeedSource("bench-missing", feeds[0].url.rsplit("/", 2)[0] + "/missing/0.xml", "持续失败的合成RSS源")
+    failing = dataclasses.replace(
+        config, feeds=dataclasses.replace(config.feeds, categories={"bench": feeds + [missing]})
+    )
+
+    # 直接创建工具管理器，以便读取工具响应缓存的统计
+    tools = ToolManager(failing, await fresh_manager(failing))
+    mcp = FastMCP("bench")
+    tools.register_tools(mcp)
+
+    calls = [
+        ("get_latest_news", {"limit": 20, "seed": 1}),
+        ("search_news", {"query": VOCABULARY[0], "limit": 10}),
+    ]
+    for name, arguments in calls:
+        await mcp.call_tool(name, arguments)
+        await recorder.run(f"failing_feed:{name}", lambda: mcp.call_tool(name, arguments), args.iterations)
+
+    stats = tools.responses.get_stats()
+    recorder.results["failing_feed:search_news"]["response_cache"] = stats
+    if tools.responses.max_entries and args.iterations and stats["hits"] < 2 * (args.iterations - 1):
+        recorder.failures.append(f"有RSS源持续失败时工具响应缓存没有命中: {stats}")
+
+
+BENCHMARKS = {
+    "cache": bench_cache,
+    "fetch_feed": bench_fetch_feed,
+    "fan_out": bench_fan_out,
+    "search": bench_search,
+    "tools": bench_tools,
+    "failing_feed": bench_failing_feed,
+}
+
+
+def git_commit() -> Optional[str]:
+    """当前代码版本"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """启动合成源服务器并运行选中的用例"""
+    server = SyntheticFeedServer(FeedServerConfig(
+        items=args.items,
+        body_size=args.body_size,
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )).start()
+    config = make_config(server.feed_urls(args.feeds), args)
+    recorder = Recorder()
+
+    print(f"{'用例':<32}{'次数':>7}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'吞吐(次/秒)':>10}")
+    try:
+        for name in args.only or SCENARIOS:
+            await BENCHMARKS[name](recorder, config, args)
+    finally:
+        await get_fetcher().close()
+        get_parser().close()
+        server.stop()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parsing_mode": config.parsing.mode,
+        },
+        "params": {key: value for key, value in vars(args).items() if key != "output"},
+        "server": {
+            "requests": server.requests,
+            "not_modified": server.not_modified,
+            "errors": server.errors,
+        },
+        "peak_rss_kb": peak_rss_kb(),
+        "results": recorder.results,
+        "failures": recorder.failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线基准测试套件")
+    parser.add_argument("--feeds", type=int, default=20, help="合成RSS源数量")
+    parser.add_argument("--items", type=int, default=50, help="每个源的条目数")
+    parser.add_argument("--body-size", type=int, default=2048, help="每个条目的正文字节数")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="每个请求的额外延迟（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回503的请求比例")
+    parser.add_argument("--seed", type=int, default=0, help="合成内容和错误注入的随机种子")
+    parser.add_argument("--iterations", type=int, default=50, help="缓存命中类用例的运行次数")
+    parser.add_argument("--cold-iterations", type=int, default=3, help="冷启动并发获取的运行次数")
+    parser.add_argument("--cache-keys", type=int, default=100, help="缓存吞吐用例的键数量")
+    parser.add_argument("--no-response-cache", action="store_true", help="禁用工具响应缓存")
+    parser.add_argument("--only", nargs="+", choices=SCENARIOS, help="只运行指定的用例组")
+    parser.add_argument("--output", help="结果文件路径，默认 benchmarks/results/<时间>.json")
+    args = parser.parse_args()
+
+    # 注入错误时的失败日志是预期行为，不输出
+    logging.basicConfig(level=logging.CRITICAL if args.error_rate else logging.WARNING)
+
+    report = asyncio.run(run(args))
+
+    output = Path(args.output) if args.output else \
+        project_root / "benchmarks" / "results" / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"峰值内存: {report['peak_rss_kb'] / 1024:.1f} MB，结果已写入 {output}")
+    for failure in report["failures"]:
+        print(f"检查未通过: {failure}")
+    if report["failures"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
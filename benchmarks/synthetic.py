@@ -0,0 +1,188 @@
+"""
+合成RSS源
+生成RSS/Atom文档，并提供可配置条目数、正文大小、延迟和错误率的本地HTTP服务器
+"""
+
+import hashlib
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+
+_LOREM = "Lorem ipsum dolor sit amet, consectetur adipiscing elit &amp; sed do eiusmod. "
+
+# 标题词表，使搜索基准有不同的选择性
+VOCABULARY = [
+    "market", "climate", "election", "science", "robot", "space", "energy", "health",
+    "football", "music", "travel", "startup", "security", "ocean", "vaccine", "bitcoin",
+    "人工智能", "经济", "气候", "科技", "航天", "新能源", "教育", "医疗",
+]
+
+
+def _body(body_size: int) -> str:
+    return (_LOREM * (body_size // len(_LOREM) + 1))[:body_size]
+
+
+def _title(rng: random.Random, feed_id: int, index: int) -> str:
+    words = " ".join(rng.sample(VOCABULARY, 3))
+    return f"Article {feed_id}-{index} {words}"
+
+
+def make_rss(items: int, body_size: int, feed_id: int = 0, seed: int = 0) -> bytes:
+    """生成RSS 2.0文档，每个条目带有约body_size字节的HTML正文"""
+    rng = random.Random(seed * 100003 + feed_id)
+    body = _body(body_size)
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">',
+        f'<channel><title>Bench RSS {feed_id}</title><link>https://example.com/{feed_id}/</link><ttl>30</ttl>',
+    ]
+    for i in range(items):
+        parts.append(
+            f'<item><title>{_title(rng, feed_id, i)} &amp; 新闻标题 {i}</title>'
+            f'<link>https://example.com/{feed_id}/articles/{i}?a=1&amp;b=2</link>'
+            f'<guid isPermaLink="false">article-{feed_id}-{i}</guid>'
+            f'<pubDate>Mon, {1 + i % 28:02d} Jan 2024 {i % 24:02d}:{feed_id % 60:02d}:00 GMT</pubDate>'
+            f'<description><![CDATA[<p>Summary {i} <b>bold</b> <script>alert(1)</script></p>]]></description>'
+            f'<content:encoded><![CDATA[<div><p>{body}</p><img src="https://example.com/{i}.png"/></div>]]></content:encoded>'
+            '</item>'
+        )
+    parts.append('</channel></rss>')
+    return "".join(parts).encode("utf-8")
+
+
+def make_atom(items: int, body_size: int, feed_id: int = 0, seed: int = 0) -> bytes:
+    """生成Atom 1.0文档"""
+    rng = random.Random(seed * 100003 + feed_id)
+    body = _body(body_size)
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        f'<feed xmlns="http://www.w3.org/2005/Atom"><title>Bench Atom {feed_id}</title><id>urn:bench:{feed_id}</id>',
+    ]
+    for i in range(items):
+        parts.append(
+            f'<entry><title type="html">{_title(rng, feed_id, i)} &lt;i&gt;italic&lt;/i&gt;</title>'
+            f'<link rel="alternate" href="https://example.com/{feed_id}/entries/{i}"/>'
+            f'<link rel="edit" href="https://example.com/{feed_id}/edit/{i}"/>'
+            f'<id>urn:entry:{feed_id}:{i}</id>'
+            f'<published>2024-01-{1 + i % 28:02d}T{i % 24:02d}:00:00+08:00</published>'
+            f'<updated>2024-02-01T00:00:00Z</updated>'
+            f'<content type="html">&lt;p&gt;{body}&lt;/p&gt;</content>'
+            '</entry>'
+        )
+    parts.append('</feed>')
+    return "".join(parts).encode("utf-8")
+
+
+@dataclass
+class FeedServerConfig:
+    """合成RSS源服务器配置"""
+    items: int = 50  # 每个源的条目数
+    body_size: int = 2048  # 每个条目的正文字节数
+    latency: float = 0.0  # 每个请求的额外延迟（秒）
+    error_rate: float = 0.0  # 返回503的请求比例
+    seed: int = 0
+
+
+class SyntheticFeedServer:
+    """
+    本地合成RSS源服务器
+
+    路径为 /rss/<编号>.xml 或 /atom/<编号>.xml，同一源的内容不变并带有ETag，
+    携带If-None-Match的请求返回304。
+    """
+
+    def __init__(self, config: FeedServerConfig):
+        self.config = config
+        self.requests = 0
+        self.not_modified = 0
+        self.errors = 0
+        self._documents: Dict[Tuple[str, int], Tuple[bytes, str]] = {}
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def feed_urls(self, count: int) -> List[str]:
+        """前count个源的地址，RSS和Atom交替"""
+        return [
+            f"{self.base_url}/{'rss' if i % 2 == 0 else 'atom'}/{i}.xml"
+            for i in range(count)
+        ]
+
+    def start(self) -> "SyntheticFeedServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _document(self, kind: str, feed_id: int) -> Tuple[bytes, str]:
+        key = (kind, feed_id)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                make = make_rss if kind == "rss" else make_atom
+                content = make(self.config.items, self.config.body_size, feed_id, self.config.seed)
+                document = self._documents[key] = (content, '"' + hashlib.sha1(content).hexdigest() + '"')
+            return document
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    failed = server._rng.random() < server.config.error_rate
+
+                if server.config.latency:
+                    time.sleep(server.config.latency)
+
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if len(parts) != 2 or parts[0] not in ("rss", "atom") or not parts[1].endswith(".xml"):
+                    self._reply(404, b"not found", "text/plain")
+                    return
+                if failed:
+                    with server._lock:
+                        server.errors += 1
+                    self._reply(503, b"unavailable", "text/plain")
+                    return
+
+                content, etag = server._document(parts[0], int(parts[1][:-4]))
+                if self.headers.get("If-None-Match") == etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    self._reply(304, b"", None, etag)
+                    return
+
+                content_type = "application/rss+xml" if parts[0] == "rss" else "application/atom+xml"
+                self._reply(200, content, content_type, etag)
+
+            def _reply(self, status, body, content_type, etag=None):
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -7,7 +7,7 @@ import os
 import yaml
 import logging
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -45,6 +45,11 @@ class CacheConfig:
     enabled: bool
     duration: int
     max_size: int
+    stale_while_revalidate: int = 60  # 过期后返回旧数据并后台刷新的时间窗口（秒）
+    stale_if_error: int = 3600  # 源不可用时继续返回旧数据的时间窗口（秒）
+    max_bytes: int = 64 * 1024 * 1024  # 最大缓存字节数（近似值）
+    persistent_path: str = ""  # 磁盘缓存文件路径（SQLite），为空时不启用
+    response_cache_size: int = 256  # 工具响应缓存条目数，0表示禁用
 
 
 @dataclass
@@ -54,6 +59,61 @@ class LimitsConfig:
     default_article_limit: int
     max_search_results: int
     request_timeout: int
+    max_concurrent_fetches: int = 16  # 全局同时下载的RSS源数量
+    max_fetches_per_host: int = 2  # 同一主机同时下载的RSS源数量
+    max_paginated_results: int = 500  # 分页时单个结果集的最大文章数
+    cursor_snapshots: int = 64  # 分页游标保存的结果快照数
+
+
+@dataclass
+class RefreshConfig:
+    """后台刷新配置"""
+    enabled: bool = True
+    min_interval: int = 60  # 最短轮询间隔（秒）
+    max_interval: int = 3600  # 最长轮询间隔（秒）
+    max_concurrent: int = 4  # 同时刷新的RSS源数量
+
+
+@dataclass
+class ParsingConfig:
+    """RSS解析配置"""
+    mode: str = "thread"  # thread：默认线程池；process：独立进程池（多核并行解析）
+    workers: int = 0  # 进程池大小，0表示CPU核数
+    fast_path: bool = True  # 规范的RSS 2.0/Atom文档使用流式解析，只读取前max_articles个条目
+
+
+@dataclass
+class HealthConfig:
+    """RSS源健康检查（熔断）配置"""
+    failure_threshold: int = 3  # 熔断打开所需的连续失败次数
+    base_backoff: int = 30  # 首次失败后的退避时间（秒）
+    max_backoff: int = 1800  # 最长退避时间（秒）
+
+
+@dataclass
+class MetricsConfig:
+    """指标导出配置"""
+    enabled: bool = True
+    path: str = "/metrics"  # HTTP传输下的指标路由
+
+
+@dataclass
+class ProfilingConfig:
+    """按需性能分析配置"""
+    token_env: str = "NEWS_MCP_ADMIN_TOKEN"  # 管理令牌所在的环境变量，未设置时不注册/debug路由
+    max_seconds: int = 120  # 单次CPU剖析的最长时间（秒）
+    signals: bool = True  # 安装SIGUSR1/SIGUSR2处理（stdio模式下使用）
+    signal_seconds: int = 30  # SIGUSR1触发的CPU剖析时长（秒）
+    dump_dir: str = "data/profiles"  # 信号触发时输出文件的目录
+
+
+@dataclass
+class WorkersConfig:
+    """多进程配置（仅streamable-http传输）"""
+    count: int = 1  # 工作进程数，大于1时预派生多个进程监听同一端口
+    uvloop: bool = True  # 安装了uvloop时工作进程使用uvloop事件循环
+    lock_path: str = "data/refresher.lock"  # 后台刷新进程选举使用的锁文件
+    election_interval: int = 15  # 未当选的进程重新尝试的间隔（秒）
 
 
 @dataclass
@@ -69,6 +129,16 @@ class FeedSource:
     name: str
     url: str
     description: str
+    quota: Optional[int] = None  # 平衡选取时该源每次最多提供的文章数，覆盖sampling.max_per_source，0表示不参与
+
+
+@dataclass
+class SamplingConfig:
+    """平衡选取配置（get_latest_news）"""
+    min_per_source: int = 1  # 每个源每次至少选取的文章数
+    max_per_source: int = 2  # 每个源每次最多选取的文章数
+    pool_size: int = 10  # 每个源参与选取的最新文章数
+    recency_decay: float = 0.8  # 候选文章按新旧排名的权重衰减系数，1表示不区分新旧
 
 
 @dataclass
@@ -79,6 +149,7 @@ class FeedsConfig:
     max_articles: int
     default_limit: int
     max_feeds_per_request: int
+    sampling: SamplingConfig = field(default_factory=SamplingConfig)
 
 
 @dataclass
@@ -91,6 +162,12 @@ class AppConfig:
     limits: LimitsConfig
     tools: ToolsConfig
     feeds: FeedsConfig
+    refresh: RefreshConfig
+    health: HealthConfig
+    parsing: ParsingConfig
+    metrics: MetricsConfig
+    profiling: ProfilingConfig
+    workers: WorkersConfig
 
 
 class ConfigLoader:
@@ -114,7 +191,13 @@ class ConfigLoader:
             cache=server_config.cache,
             limits=server_config.limits,
             tools=tools_config,
-            feeds=feeds_config
+            feeds=feeds_config,
+            refresh=server_config.refresh,
+            health=server_config.health,
+            parsing=server_config.parsing,
+            metrics=server_config.metrics,
+            profiling=server_config.profiling,
+            workers=server_config.workers
         )
     
     def _load_server_config(self) -> Any:
@@ -139,7 +222,13 @@ class ConfigLoader:
             'logging': LoggingConfig(**data['logging']),
             'cache': CacheConfig(**data['cache']),
             'limits': LimitsConfig(**data['limits']),
-            'tools': ToolsConfig(**data['tools'])
+            'tools': ToolsConfig(**data['tools']),
+            'refresh': RefreshConfig(**data.get('refresh', {})),
+            'health': HealthConfig(**data.get('health', {})),
+            'parsing': ParsingConfig(**data.get('parsing', {})),
+            'metrics': MetricsConfig(**data.get('metrics', {})),
+            'profiling': ProfilingConfig(**data.get('profiling', {})),
+            'workers': WorkersConfig(**data.get('workers', {}))
         })()
     
     def _load_feeds_config(self) -> FeedsConfig:
@@ -169,7 +258,8 @@ class ConfigLoader:
             cache_duration=data['defaults']['cache_duration'],
             max_articles=data['defaults']['max_articles'],
             default_limit=data['defaults']['default_limit'],
-            max_feeds_per_request=data['defaults']['max_feeds_per_request']
+            max_feeds_per_request=data['defaults']['max_feeds_per_request'],
+            sampling=SamplingConfig(**data.get('sampling', {}))
         )
     
     def _load_custom_feeds(self) -> Optional[List[FeedSource]]:
@@ -0,0 +1,118 @@
+"""
+文章模块
+定义紧凑的文章类型，只在生成工具响应时转换为字典
+"""
+
+import sys
+from typing import Any, Dict, List
+
+from ..config.settings import FeedSource
+
+
+class Article:
+    """
+    文章
+
+    使用__slots__存储字段；来源名称和RSS源地址不逐篇保存，而是引用所属的FeedSource。
+    """
+
+    __slots__ = ("id", "title", "link", "summary", "published", "published_timestamp", "feed")
+
+    def __init__(self, id: str, title: str, link: str, summary: str, published: str,
+                 published_timestamp: float, feed: FeedSource):
+        """
+        初始化文章
+
+        Args:
+            id: 文章ID
+            title: 标题
+            link: 链接
+            summary: 摘要
+            published: 发布时间字符串
+            published_timestamp: 发布时间戳
+            feed: 所属RSS源
+        """
+        self.id = sys.intern(id)
+        self.title = title
+        self.link = link
+        self.summary = summary
+        self.published = published
+        self.published_timestamp = float(published_timestamp)
+        self.feed = feed
+
+    @property
+    def source(self) -> str:
+        """来源名称"""
+        return self.feed.name
+
+    @property
+    def feed_url(self) -> str:
+        """RSS源地址"""
+        return self.feed.url
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为工具响应使用的字典
+
+        Returns:
+            文章信息
+        """
+        return {
+            "title": self.title,
+            "link": self.link,
+            "summary": self.summary,
+            "published": self.published,
+            "published_timestamp": self.published_timestamp,
+            "source": self.feed.name,
+            "feed_url": self.feed.url,
+            "id": self.id
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], feed: FeedSource) -> "Article":
+        """
+        从字典恢复文章（磁盘缓存层保存的是字典）
+
+        Args:
+            data: 文章信息
+            feed: 所属RSS源
+
+        Returns:
+            文章
+        """
+        return cls(
+            data["id"],
+            data.get("title", ""),
+            data.get("link", ""),
+            data.get("summary", ""),
+            data.get("published", ""),
+            data.get("published_timestamp", 0),
+            feed
+        )
+
+    def __sizeof__(self) -> int:
+        # 计入文章自身持有的字符串，所属RSS源是共享引用，不计入
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self.title)
+            + sys.getsizeof(self.link)
+            + sys.getsizeof(self.summary)
+            + sys.getsizeof(self.published)
+            + sys.getsizeof(self.published_timestamp)
+        )
+
+    def __repr__(self) -> str:
+        return f"Article(id={self.id!r}, title={self.title!r}, source={self.feed.name!r})"
+
+
+def to_dicts(articles: List[Article]) -> List[Dict[str, Any]]:
+    """
+    将文章列表转换为字典列表
+
+    Args:
+        articles: 文章列表
+
+    Returns:
+        字典列表
+    """
+    return [article.to_dict() for article in articles]
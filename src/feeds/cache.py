@@ -3,62 +3,444 @@
 负责RSS源内容的缓存管理
 """
 
+import sys
+import json
 import time
+import heapq
 import asyncio
-from typing import Dict, List, Any, Optional
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
+from .health import FeedUnavailableError
+
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class CacheEntry:
     """缓存条目"""
     data: List[Dict[str, Any]]
     timestamp: float
-    ttl: int  # 生存时间（秒）
+    ttl: int  # 生存时间（秒），超过后为软过期
+    etag: Optional[str] = None  # HTTP ETag校验值
+    last_modified: Optional[str] = None  # HTTP Last-Modified校验值
+    stale_while_revalidate: int = 0  # 软过期后仍可直接返回的时间（秒）
+    stale_if_error: int = 0  # 刷新失败时仍可返回的时间（秒）
+    size: int = 0  # 近似占用字节数
+    version: int = 0  # 对应过期堆中的记录，用于识别失效的堆记录
     
     def is_expired(self) -> bool:
-        """检查是否过期"""
+        """检查是否过期（软过期）"""
         return time.time() - self.timestamp > self.ttl
+    
+    def is_servable(self) -> bool:
+        """检查是否仍可直接返回（未超过硬过期时间）"""
+        return time.time() - self.timestamp <= self.ttl + self.stale_while_revalidate
+    
+    def is_servable_on_error(self) -> bool:
+        """检查刷新失败时是否仍可返回"""
+        return time.time() - self.timestamp <= self.ttl + max(self.stale_if_error, self.stale_while_revalidate)
+    
+    def dead_at(self) -> float:
+        """条目完全失效（可被清理）的时间"""
+        return self.timestamp + self.ttl + max(self.stale_if_error, self.stale_while_revalidate)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    估算缓存数据占用的字节数（近似值，不追踪共享引用）
+    
+    Args:
+        value: 缓存数据
+        
+    Returns:
+        近似字节数
+    """
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _to_json(value: Any) -> Any:
+    """序列化缓存数据中的对象（如文章），对象需提供to_dict方法"""
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"无法序列化的缓存数据类型: {type(value).__name__}")
+    return to_dict()
+
+
+class PersistentCacheTier:
+    """
+    磁盘缓存层（SQLite WAL）
+    
+    保存缓存数据和HTTP校验值，进程重启或stdio会话重新启动后可直接从磁盘恢复。
+    读取由FeedCache放到线程池中执行（按需加载单个键），写入由单个后台线程按顺序执行。
+    """
+    
+    def __init__(self, path: str):
+        """
+        初始化磁盘缓存层
+        
+        Args:
+            path: SQLite数据库文件路径
+        """
+        self.path = Path(path)
+        self._local = threading.local()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-writer")
+        self.reads = 0
+        self.writes = 0
+        self.errors = 0
+    
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接（首次使用时创建）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, timestamp REAL NOT NULL, "
+                "ttl INTEGER NOT NULL, etag TEXT, last_modified TEXT)"
+            )
+            conn.commit()
+            self._local.conn = conn
+        return conn
+    
+    def load(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], float, int, Optional[str], Optional[str]]]:
+        """
+        读取缓存条目
+        
+        Args:
+            key: 缓存键
+            
+        Returns:
+            (数据, 写入时间, 生存时间, ETag, Last-Modified)，不存在或读取失败时返回None
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT data, timestamp, ttl, etag, last_modified FROM cache_entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"读取磁盘缓存失败: {key} - {e}")
+            return None
+        
+        if row is None:
+            return None
+        
+        self.reads += 1
+        data, timestamp, ttl, etag, last_modified = row
+        return json.loads(data), timestamp, ttl, etag, last_modified
+    
+    def save(self, key: str, entry: CacheEntry) -> None:
+        """异步写入缓存条目（JSON序列化也在写入线程中执行，缓存数据写入后不再修改）"""
+        self._writer.submit(
+            self._save,
+            key, entry.data, entry.timestamp, entry.ttl, entry.etag, entry.last_modified
+        )
+    
+    def _save(self, key: str, data: Any, timestamp: float, ttl: int,
+              etag: Optional[str], last_modified: Optional[str]) -> None:
+        """在写入线程中序列化并写入缓存条目"""
+        try:
+            payload = json.dumps(data, ensure_ascii=False, default=_to_json)
+        except (TypeError, ValueError) as e:
+            self.errors += 1
+            logger.warning(f"序列化磁盘缓存失败: {key} - {e}")
+            return
+        self._execute(
+            "INSERT OR REPLACE INTO cache_entries (key, data, timestamp, ttl, etag, last_modified) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, payload, timestamp, ttl, etag, last_modified)
+        )
+    
+    def touch(self, key: str, timestamp: float, ttl: int) -> None:
+        """异步更新缓存条目的写入时间和生存时间"""
+        self._writer.submit(
+            self._execute,
+            "UPDATE cache_entries SET timestamp = ?, ttl = ? WHERE key = ?",
+            (timestamp, ttl, key)
+        )
+    
+    def delete(self, key: str) -> None:
+        """异步删除缓存条目"""
+        self._writer.submit(self._execute, "DELETE FROM cache_entries WHERE key = ?", (key,))
+    
+    def clear(self) -> None:
+        """异步清空磁盘缓存"""
+        self._writer.submit(self._execute, "DELETE FROM cache_entries", ())
+    
+    def purge_before(self, cutoff: float, max_stale: int) -> None:
+        """异步删除在cutoff之前已完全失效的条目"""
+        self._writer.submit(
+            self._execute,
+            "DELETE FROM cache_entries WHERE timestamp + ttl + ? < ?",
+            (max_stale, cutoff)
+        )
+    
+    def flush(self) -> None:
+        """等待所有排队的写入完成"""
+        self._writer.submit(lambda: None).result()
+    
+    def _execute(self, sql: str, params: Tuple) -> None:
+        """在写入线程中执行SQL"""
+        try:
+            conn = self._connect()
+            conn.execute(sql, params)
+            conn.commit()
+            self.writes += 1
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"写入磁盘缓存失败: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取磁盘缓存统计信息"""
+        return {
+            "path": str(self.path),
+            "reads": self.reads,
+            "writes": self.writes,
+            "errors": self.errors
+        }
 
 
 class FeedCache:
-    """RSS源缓存管理器"""
+    """
+    RSS源缓存管理器
+    
+    基于有序字典实现O(1)的LRU，过期时间由最小堆维护。
+    内存操作在事件循环内都不会让出执行权，因此读写无需加锁；只有读取磁盘缓存层时让出执行权，
+    读取完成后以内存中的条目为准。同一RSS源的刷新由FeedManager的请求合并保证串行。
+    """
     
-    def __init__(self, default_ttl: int = 300, max_size: int = 100):
+    def __init__(self, default_ttl: int = 300, max_size: int = 100,
+                 stale_while_revalidate: int = 0, stale_if_error: int = 0,
+                 max_bytes: int = 0, persistent: Optional[PersistentCacheTier] = None,
+                 shared: bool = False):
         """
         初始化缓存管理器
         
         Args:
             default_ttl: 默认缓存时间（秒）
             max_size: 最大缓存条目数
+            stale_while_revalidate: 软过期后返回旧数据并后台刷新的时间窗口（秒）
+            stale_if_error: 刷新失败时继续返回旧数据的时间窗口（秒）
+            max_bytes: 最大缓存字节数（近似值），0表示不限制
+            persistent: 磁盘缓存层，内存未命中时按需从磁盘加载
+            shared: 磁盘缓存层由多个进程共享，内存条目过期时先检查其他进程是否已写入新数据
         """
         self.default_ttl = default_ttl
         self.max_size = max_size
-        self._cache: Dict[str, CacheEntry] = {}
-        self._lock = asyncio.Lock()
+        self.max_bytes = max_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._expiry: List[Tuple[float, int, str]] = []  # (失效时间, 版本, 键)
+        self._version = 0
+        self._bytes = 0
+        self._revalidating: Dict[str, asyncio.Task] = {}
+        self.persistent = persistent
+        self.shared = shared and persistent is not None
+        
+        if self.persistent is not None:
+            self.persistent.purge_before(time.time(), max(stale_if_error, stale_while_revalidate))
+        
+        # 统计信息
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_hits = 0
+        self.shared_reloads = 0
     
-    async def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+    async def get(self, key: str,
+                  revalidate: Optional[Callable[[], Awaitable[Any]]] = None) -> Optional[List[Dict[str, Any]]]:
         """
         获取缓存内容
         
+        软过期但未硬过期的条目直接返回旧数据，并通过revalidate在后台刷新（同一键只刷新一次）
+        
         Args:
             key: 缓存键
+            revalidate: 后台刷新函数，返回协程
             
         Returns:
-            缓存的数据，如果不存在或过期则返回None
+            缓存的数据，如果不存在或硬过期则返回None
         """
-        async with self._lock:
-            entry = self._cache.get(key)
-            if entry is None:
-                return None
+        entry = await self._lookup(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        if entry.is_expired() and self.shared:
+            entry = await self._reload(key, entry)
+        
+        if not entry.is_expired():
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry.data
+        
+        if not entry.is_servable():
+            # 过期条目保留，以便使用其校验值进行条件请求
+            self.misses += 1
+            return None
+        
+        self._cache.move_to_end(key)
+        self.stale_hits += 1
+        if revalidate is not None and key not in self._revalidating:
+            task = asyncio.ensure_future(self._revalidate(key, revalidate))
+            self._revalidating[key] = task
+        
+        return entry.data
+    
+    def is_fresh(self, key: str) -> bool:
+        """
+        内存缓存条目是否存在且未过期（同步检查，不计入统计、不触发刷新）
+        
+        Args:
+            key: 缓存键
             
-            if entry.is_expired():
-                del self._cache[key]
-                return None
+        Returns:
+            是否未过期
+        """
+        entry = self._cache.get(key)
+        return entry is not None and not entry.is_expired()
+    
+    def contains(self, key: str) -> bool:
+        """
+        内存中是否有该键的条目（包括已过期的条目，不检查磁盘缓存层）
+        
+        Args:
+            key: 缓存键
             
-            return entry.data
+        Returns:
+            是否存在
+        """
+        return key in self._cache
+    
+    def get_fresh(self, key: str) -> Optional[List[Any]]:
+        """
+        同步读取未过期的内存缓存条目（不加载磁盘缓存层、不触发后台刷新），命中时计入统计
+        
+        Args:
+            key: 缓存键
+            
+        Returns:
+            缓存的数据，如果不在内存中或已过期则返回None
+        """
+        entry = self._cache.get(key)
+        if entry is None or entry.is_expired():
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return entry.data
+    
+    async def _revalidate(self, key: str, revalidate: Callable[[], Awaitable[Any]]) -> None:
+        """后台刷新缓存条目"""
+        try:
+            await revalidate()
+        except FeedUnavailableError as e:
+            # 退避或熔断期间没有发出请求，不重复告警
+            logger.debug(f"跳过后台刷新缓存: {key} - {e}")
+        except Exception as e:
+            logger.warning(f"后台刷新缓存失败: {key} - {e}")
+        finally:
+            self._revalidating.pop(key, None)
+    
+    async def get_stale(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        获取刷新失败时可用的旧数据
+        
+        Args:
+            key: 缓存键
+            
+        Returns:
+            在stale-if-error窗口内的旧数据，否则返回None
+        """
+        entry = await self._lookup(key)
+        if entry is None or not entry.is_servable_on_error():
+            return None
+        return entry.data
+    
+    async def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """
+        获取缓存条目（包括已过期的条目）
+        
+        Args:
+            key: 缓存键
+            
+        Returns:
+            缓存条目，如果不存在则返回None
+        """
+        return await self._lookup(key)
+    
+    async def reload(self, key: str) -> bool:
+        """
+        从磁盘缓存层读取其他进程写入的更新数据（共享磁盘缓存时，非刷新进程等待新数据）
+        
+        Args:
+            key: 缓存键
+            
+        Returns:
+            是否读取到比内存中更新的条目
+        """
+        if self.persistent is None:
+            return False
+        
+        fresh = await self._load_persistent(key)
+        current = self._cache.get(key)
+        if fresh is None:
+            return False
+        if current is None:
+            if not fresh.is_servable_on_error():
+                return False
+            self.disk_hits += 1
+        elif fresh.timestamp <= current.timestamp:
+            return False
+        else:
+            self.shared_reloads += 1
+        
+        self._insert(key, fresh)
+        return True
     
-    async def set(self, key: str, data: List[Dict[str, Any]], ttl: Optional[int] = None) -> None:
+    async def refresh(self, key: str, ttl: Optional[int] = None) -> bool:
+        """
+        重新计算条目的生存时间（例如收到304响应时）
+        
+        Args:
+            key: 缓存键
+            ttl: 新的缓存时间，如果为None则保留原值
+            
+        Returns:
+            条目是否存在
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return False
+        
+        entry.timestamp = time.time()
+        if ttl:
+            entry.ttl = ttl
+        self._cache.move_to_end(key)
+        self._push_expiry(key, entry)
+        if self.persistent is not None:
+            self.persistent.touch(key, entry.timestamp, entry.ttl)
+        return True
+    
+    async def set(self, key: str, data: List[Dict[str, Any]], ttl: Optional[int] = None,
+                  etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
         """
         设置缓存内容
         
@@ -66,19 +448,23 @@ class FeedCache:
             key: 缓存键
             data: 要缓存的数据
             ttl: 缓存时间，如果为None则使用默认值
+            etag: HTTP ETag校验值
+            last_modified: HTTP Last-Modified校验值
         """
-        async with self._lock:
-            # 如果缓存已满，删除最旧的条目
-            if len(self._cache) >= self.max_size:
-                oldest_key = min(self._cache.keys(), 
-                               key=lambda k: self._cache[k].timestamp)
-                del self._cache[oldest_key]
-            
-            self._cache[key] = CacheEntry(
-                data=data,
-                timestamp=time.time(),
-                ttl=ttl or self.default_ttl
-            )
+        entry = CacheEntry(
+            data=data,
+            timestamp=time.time(),
+            ttl=ttl or self.default_ttl,
+            etag=etag,
+            last_modified=last_modified,
+            stale_while_revalidate=self.stale_while_revalidate,
+            stale_if_error=self.stale_if_error,
+            size=estimate_size(data)
+        )
+        
+        self._insert(key, entry)
+        if self.persistent is not None:
+            self.persistent.save(key, entry)
     
     async def delete(self, key: str) -> bool:
         """
@@ -90,16 +476,17 @@ class FeedCache:
         Returns:
             是否成功删除
         """
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+        if self.persistent is not None:
+            self.persistent.delete(key)
+        return self._remove(key)
     
     async def clear(self) -> None:
         """清空所有缓存"""
-        async with self._lock:
-            self._cache.clear()
+        self._cache.clear()
+        self._expiry.clear()
+        self._bytes = 0
+        if self.persistent is not None:
+            self.persistent.clear()
     
     async def cleanup_expired(self) -> int:
         """
@@ -108,16 +495,117 @@ class FeedCache:
         Returns:
             清理的条目数量
         """
-        async with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if entry.is_expired()
+        return self._purge_expired()
+    
+    async def _lookup(self, key: str) -> Optional[CacheEntry]:
+        """查找条目，内存未命中时从磁盘缓存层加载"""
+        entry = self._cache.get(key)
+        if entry is not None or self.persistent is None:
+            return entry
+        
+        loaded = await self._load_persistent(key)
+        # 读取磁盘期间其他协程可能已写入内存，以内存条目为准
+        entry = self._cache.get(key)
+        if entry is not None:
+            return entry
+        if loaded is None or not loaded.is_servable_on_error():
+            return None
+        
+        self.disk_hits += 1
+        self._insert(key, loaded)
+        return loaded
+    
+    async def _reload(self, key: str, entry: CacheEntry) -> CacheEntry:
+        """共享磁盘缓存时，用其他进程写入的更新数据替换已过期的内存条目"""
+        fresh = await self._load_persistent(key)
+        current = self._cache.get(key)
+        if current is not entry:
+            # 读取磁盘期间条目已被替换或删除
+            return current if current is not None else entry
+        if fresh is None or fresh.timestamp <= entry.timestamp:
+            return entry
+        
+        self.shared_reloads += 1
+        self._insert(key, fresh)
+        return fresh
+    
+    async def _load_persistent(self, key: str) -> Optional[CacheEntry]:
+        """从磁盘缓存层读取条目（不写入内存），SQLite查询和JSON解析在线程池中执行，不阻塞事件循环"""
+        row = await asyncio.to_thread(self.persistent.load, key)
+        if row is None:
+            return None
+        
+        data, timestamp, ttl, etag, last_modified = row
+        return CacheEntry(
+            data=data,
+            timestamp=timestamp,
+            ttl=ttl,
+            etag=etag,
+            last_modified=last_modified,
+            stale_while_revalidate=self.stale_while_revalidate,
+            stale_if_error=self.stale_if_error,
+            size=estimate_size(data)
+        )
+    
+    def _insert(self, key: str, entry: CacheEntry) -> None:
+        """写入内存条目并执行容量限制"""
+        self._remove(key)
+        self._cache[key] = entry
+        self._bytes += entry.size
+        self._push_expiry(key, entry)
+        self._enforce_limits()
+    
+    def _push_expiry(self, key: str, entry: CacheEntry) -> None:
+        """记录条目的失效时间，旧的堆记录通过版本号识别为失效"""
+        self._version += 1
+        entry.version = self._version
+        heapq.heappush(self._expiry, (entry.dead_at(), entry.version, key))
+    
+    def _remove(self, key: str) -> bool:
+        """删除条目并更新字节统计"""
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+    
+    def _purge_expired(self) -> int:
+        """从过期堆中清理已完全失效的条目"""
+        now = time.time()
+        purged = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            _, version, key = heapq.heappop(self._expiry)
+            entry = self._cache.get(key)
+            if entry is not None and entry.version == version:
+                self._remove(key)
+                purged += 1
+        self.expirations += purged
+        return purged
+    
+    def _enforce_limits(self) -> None:
+        """超过条目数或字节数上限时，先清理失效条目，再按LRU淘汰"""
+        if not self._over_limits():
+            return
+        
+        self._purge_expired()
+        while self._over_limits() and len(self._cache) > 1:
+            key, entry = self._cache.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+        
+        # 失效的堆记录过多时重建，避免堆无限增长
+        if len(self._expiry) > 2 * len(self._cache) + 64:
+            self._expiry = [
+                (entry.dead_at(), entry.version, key)
+                for key, entry in self._cache.items()
             ]
-            
-            for key in expired_keys:
-                del self._cache[key]
-            
-            return len(expired_keys)
+            heapq.heapify(self._expiry)
+    
+    def _over_limits(self) -> bool:
+        """是否超过条目数或字节数上限"""
+        if len(self._cache) > self.max_size:
+            return True
+        return bool(self.max_bytes) and self._bytes > self.max_bytes
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -127,10 +615,19 @@ class FeedCache:
             缓存统计信息
         """
         return {
-            "total_entries": len(self._cache),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "shared_reloads": self.shared_reloads,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._cache),
+            "bytes": self._bytes,
             "max_size": self.max_size,
+            "max_bytes": self.max_bytes,
             "default_ttl": self.default_ttl,
-            "cache_keys": list(self._cache.keys())
+            "persistent": self.persistent.get_stats() if self.persistent is not None else None
         }
 
 
@@ -146,17 +643,27 @@ def get_cache() -> FeedCache:
     return _global_cache
 
 
-def init_cache(default_ttl: int = 300, max_size: int = 100) -> FeedCache:
+def init_cache(default_ttl: int = 300, max_size: int = 100,
+               stale_while_revalidate: int = 0, stale_if_error: int = 0,
+               max_bytes: int = 0, persistent_path: Optional[str] = None,
+               shared: bool = False) -> FeedCache:
     """
     初始化全局缓存
     
     Args:
         default_ttl: 默认缓存时间
         max_size: 最大缓存大小
+        stale_while_revalidate: 软过期后后台刷新的时间窗口
+        stale_if_error: 刷新失败时继续返回旧数据的时间窗口
+        max_bytes: 最大缓存字节数（近似值）
+        persistent_path: 磁盘缓存文件路径，为空时不启用磁盘缓存层
+        shared: 磁盘缓存文件是否由多个工作进程共享
         
     Returns:
         缓存实例
     """
     global _global_cache
-    _global_cache = FeedCache(default_ttl, max_size)
+    persistent = PersistentCacheTier(persistent_path) if persistent_path else None
+    _global_cache = FeedCache(default_ttl, max_size, stale_while_revalidate, stale_if_error,
+                              max_bytes, persistent, shared)
     return _global_cache
@@ -0,0 +1,199 @@
+"""
+HTTP抓取模块
+负责RSS源的异步下载，使用共享连接池和keep-alive连接
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import feedparser
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FetchResult:
+    """抓取结果"""
+    url: str
+    status: int
+    content: bytes
+    headers: Dict[str, str]
+
+    @property
+    def not_modified(self) -> bool:
+        """服务器是否返回304（内容未变化）"""
+        return self.status == 304
+
+    @property
+    def etag(self) -> Optional[str]:
+        """响应中的ETag校验值"""
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        """响应中的Last-Modified校验值"""
+        return self.headers.get("last-modified")
+
+    @property
+    def max_age(self) -> Optional[int]:
+        """Cache-Control中声明的max-age（秒），未声明时返回None"""
+        cache_control = self.headers.get("cache-control", "")
+        for directive in cache_control.split(","):
+            name, _, value = directive.strip().partition("=")
+            if name.lower() in ("max-age", "s-maxage"):
+                try:
+                    return int(value.strip('"'))
+                except ValueError:
+                    return None
+        return None
+
+
+class FeedFetcher:
+    """RSS源HTTP抓取器"""
+
+    def __init__(self, timeout: float = 30, max_connections: int = 100,
+                 max_keepalive_connections: int = 20, keepalive_expiry: float = 60.0,
+                 max_concurrent: int = 16, max_per_host: int = 2):
+        """
+        初始化抓取器
+
+        Args:
+            timeout: 连接/读取超时时间（秒）
+            max_connections: 连接池最大连接数
+            max_keepalive_connections: 最大keep-alive连接数
+            keepalive_expiry: keep-alive连接空闲过期时间（秒）
+            max_concurrent: 全局同时进行的请求数
+            max_per_host: 同一主机同时进行的请求数
+        """
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_concurrent = max_concurrent
+        self.max_per_host = max_per_host
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global_limit = asyncio.Semaphore(max_concurrent)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.in_flight = 0
+        self.pending = 0  # 已发起但未完成的请求数（含等待并发配额的请求）
+
+    @property
+    def waiting(self) -> int:
+        """等待并发配额的请求数"""
+        return self.pending - self.in_flight
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取共享的HTTP客户端（首次使用时创建）"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                ),
+                headers={
+                    # 与feedparser自带的请求头保持一致
+                    "User-Agent": feedparser.USER_AGENT,
+                    "Accept": feedparser.http.ACCEPT_HEADER
+                },
+                follow_redirects=True
+            )
+        return self._client
+
+    async def fetch(self, url: str, etag: Optional[str] = None,
+                    last_modified: Optional[str] = None) -> FetchResult:
+        """
+        下载RSS源内容，提供校验值时发送条件请求
+
+        Args:
+            url: RSS源地址
+            etag: 上次响应的ETag，用于If-None-Match
+            last_modified: 上次响应的Last-Modified，用于If-Modified-Since
+
+        Returns:
+            抓取结果，内容未变化时status为304且content为空
+
+        Raises:
+            httpx.HTTPError: 网络错误、超时或非2xx/304响应
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        host = urlsplit(url).hostname or ""
+        host_limit = self._host_limits.get(host)
+        if host_limit is None:
+            host_limit = self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+
+        # 先占用主机配额再占用全局配额，避免同一主机的排队请求占满全局并发
+        client = self._get_client()
+        self.pending += 1
+        try:
+            async with host_limit, self._global_limit:
+                self.in_flight += 1
+                try:
+                    response = await client.get(url, headers=headers)
+                finally:
+                    self.in_flight -= 1
+        finally:
+            self.pending -= 1
+
+        if response.status_code == 304:
+            return FetchResult(
+                url=str(response.url),
+                status=304,
+                content=b"",
+                headers=dict(response.headers)
+            )
+
+        response.raise_for_status()
+
+        return FetchResult(
+            url=str(response.url),
+            status=response.status_code,
+            content=response.content,
+            headers=dict(response.headers)
+        )
+
+    async def close(self) -> None:
+        """关闭连接池"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# 全局抓取器实例
+_global_fetcher: Optional[FeedFetcher] = None
+
+
+def get_fetcher() -> FeedFetcher:
+    """获取全局抓取器实例"""
+    global _global_fetcher
+    if _global_fetcher is None:
+        _global_fetcher = FeedFetcher()
+    return _global_fetcher
+
+
+def init_fetcher(timeout: float = 30, max_concurrent: int = 16, max_per_host: int = 2) -> FeedFetcher:
+    """
+    初始化全局抓取器
+
+    Args:
+        timeout: 请求超时时间（秒）
+        max_concurrent: 全局同时进行的请求数
+        max_per_host: 同一主机同时进行的请求数
+
+    Returns:
+        抓取器实例
+    """
+    global _global_fetcher
+    _global_fetcher = FeedFetcher(timeout=timeout, max_concurrent=max_concurrent, max_per_host=max_per_host)
+    return _global_fetcher
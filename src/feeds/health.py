@@ -0,0 +1,219 @@
+"""
+RSS源健康状态模块
+按RSS源跟踪连续失败，提供指数退避的失败缓存和熔断器
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from ..config.settings import FeedSource
+
+
+class FeedUnavailableError(Exception):
+    """RSS源处于退避或熔断状态，本次不发起请求"""
+
+
+class CircuitBreaker:
+    """
+    单个RSS源的熔断器
+
+    每次失败后在指数增长的退避时间内不再请求（失败缓存）；
+    连续失败达到阈值后熔断打开，退避结束时进入半开状态，只放行一次探测请求，
+    探测成功则关闭，失败则以更长的退避时间重新打开。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3,
+                 base_backoff: float = 30, max_backoff: float = 1800):
+        """
+        初始化熔断器
+
+        Args:
+            name: RSS源名称
+            failure_threshold: 熔断打开所需的连续失败次数
+            base_backoff: 首次失败后的退避时间（秒）
+            max_backoff: 最长退避时间（秒）
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+        self.last_error: Optional[str] = None
+        self.total_failures = 0
+        self.rejected = 0
+
+    def allow_request(self) -> bool:
+        """
+        是否允许发起请求
+
+        Returns:
+            允许时返回True；熔断打开且退避结束时转为半开并放行一次探测
+        """
+        now = time.time()
+        if now < self.retry_at:
+            self.rejected += 1
+            return False
+
+        if self.state != self.CLOSED:
+            # 放行一次探测；探测期间其余请求继续拒绝，探测未返回结果（如被取消）时到期后重新探测
+            self.state = self.HALF_OPEN
+            self.retry_at = now + self.base_backoff
+        return True
+
+    def is_backing_off(self) -> bool:
+        """是否处于退避时间内（只读检查，不计入拒绝次数、不改变状态）"""
+        return time.time() < self.retry_at
+
+    def record_success(self) -> None:
+        """记录成功，关闭熔断器"""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+        self.last_error = None
+
+    def record_failure(self, error: Exception) -> None:
+        """
+        记录失败并计算退避时间
+
+        Args:
+            error: 失败原因
+        """
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        self.last_error = str(error)
+
+        backoff = min(self.base_backoff * 2 ** (self.consecutive_failures - 1), self.max_backoff)
+        self.retry_at = time.time() + backoff
+
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取熔断器状态"""
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in": round(max(self.retry_at - time.time(), 0), 1),
+            "last_error": self.last_error,
+            "total_failures": self.total_failures,
+            "rejected": self.rejected
+        }
+
+
+class FeedHealthTracker:
+    """所有RSS源的健康状态"""
+
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 30, max_backoff: float = 1800):
+        """
+        初始化健康状态跟踪器
+
+        Args:
+            failure_threshold: 熔断打开所需的连续失败次数
+            base_backoff: 首次失败后的退避时间（秒）
+            max_backoff: 最长退避时间（秒）
+        """
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get_breaker(self, feed_source: FeedSource) -> CircuitBreaker:
+        """获取RSS源的熔断器（首次使用时创建）"""
+        breaker = self._breakers.get(feed_source.url)
+        if breaker is None:
+            breaker = self._breakers[feed_source.url] = CircuitBreaker(
+                feed_source.name, self.failure_threshold, self.base_backoff, self.max_backoff
+            )
+        return breaker
+
+    def check(self, feed_source: FeedSource) -> None:
+        """
+        检查是否允许请求RSS源
+
+        Args:
+            feed_source: RSS源配置
+
+        Raises:
+            FeedUnavailableError: RSS源处于退避或熔断状态
+        """
+        breaker = self.get_breaker(feed_source)
+        if not breaker.allow_request():
+            raise FeedUnavailableError(
+                f"RSS源暂不可用（{breaker.state}，{breaker.retry_at - time.time():.0f}秒后重试）: {breaker.last_error}"
+            )
+
+    def is_available(self, feed_source: FeedSource) -> bool:
+        """
+        当前是否会放行RSS源的请求（只读检查，不触发半开探测）
+
+        Args:
+            feed_source: RSS源配置
+
+        Returns:
+            不在退避或熔断时间内时返回True
+        """
+        breaker = self._breakers.get(feed_source.url)
+        return breaker is None or not breaker.is_backing_off()
+
+    def record_success(self, feed_source: FeedSource) -> None:
+        """记录RSS源请求成功"""
+        self.get_breaker(feed_source).record_success()
+
+    def record_failure(self, feed_source: FeedSource, error: Exception) -> None:
+        """记录RSS源请求失败"""
+        self.get_breaker(feed_source).record_failure(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取健康状态统计
+
+        Returns:
+            各状态的源数量，以及非正常源的详细状态
+        """
+        states = {CircuitBreaker.CLOSED: 0, CircuitBreaker.OPEN: 0, CircuitBreaker.HALF_OPEN: 0}
+        unhealthy = {}
+        for breaker in self._breakers.values():
+            states[breaker.state] += 1
+            if breaker.consecutive_failures:
+                unhealthy[breaker.name] = breaker.get_stats()
+        return {
+            "states": states,
+            "unhealthy_feeds": unhealthy
+        }
+
+
+# 全局健康状态实例
+_global_health: Optional[FeedHealthTracker] = None
+
+
+def get_health_tracker() -> FeedHealthTracker:
+    """获取全局健康状态实例"""
+    global _global_health
+    if _global_health is None:
+        _global_health = FeedHealthTracker()
+    return _global_health
+
+
+def init_health_tracker(failure_threshold: int = 3, base_backoff: float = 30,
+                        max_backoff: float = 1800) -> FeedHealthTracker:
+    """
+    初始化全局健康状态跟踪器
+
+    Args:
+        failure_threshold: 熔断打开所需的连续失败次数
+        base_backoff: 首次失败后的退避时间（秒）
+        max_backoff: 最长退避时间（秒）
+
+    Returns:
+        健康状态跟踪器实例
+    """
+    global _global_health
+    _global_health = FeedHealthTracker(failure_threshold, base_backoff, max_backoff)
+    return _global_health
@@ -5,19 +5,39 @@ RSS源管理模块
 
 import asyncio
 import logging
-import feedparser
 import time
-import random
-from datetime import datetime
-from email.utils import parsedate_to_datetime
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
+
+import httpx
 
 from ..config.settings import FeedSource, FeedsConfig
+from ..metrics import get_metrics
+from .article import Article
 from .cache import get_cache
+from .fetcher import get_fetcher
+from .health import FeedUnavailableError, get_health_tracker
+from .parser import EntryTuple, get_parser
+from .singleflight import SingleFlight
+from .store import ArticleStore, UrlIndex, make_article_id
+from .sampling import BalancedSampler
+from .search import SearchIndex
+from .timeline import TimelineIndex
 
 
 logger = logging.getLogger(__name__)
 
+# 非刷新进程轮询共享磁盘缓存的间隔（秒）
+_SHARED_POLL_INTERVAL = 0.5
+
+
+@dataclass
+class FeedRefreshResult:
+    """单次RSS源刷新的结果"""
+    articles: List[Article]
+    changed: bool  # 内容是否发生变化
+    poll_hint: Optional[float] = None  # 源或HTTP声明的最短刷新间隔（秒）
+
 
 class FeedManager:
     """RSS源管理器"""
@@ -31,8 +51,25 @@ class FeedManager:
         """
         self.config = config
         self.cache = get_cache()
+        self.fetcher = get_fetcher()
+        self.health = get_health_tracker()
+        self.parser = get_parser()
+        self.metrics = get_metrics()
+        self._inflight = SingleFlight()
+        self.store = ArticleStore(config.max_articles)
+        self.search_index = SearchIndex()
+        self.store.add_listener(self.search_index.apply)
+        self.url_index = UrlIndex()
+        self.store.add_listener(self.url_index.apply)
+        self.timelines = TimelineIndex(config.categories)
+        self.store.add_listener(self.timelines.apply)
+        self.sampler = BalancedSampler(self.store, config.sampling)
+        self.store.add_listener(self.sampler.apply)
+        self._ttl_overrides: Dict[str, float] = {}
+        self._all_loaded = False  # 是否已对全部RSS源执行过加载（get_article_details使用）
+        self._follower_check: Optional[Callable[[], bool]] = None
         
-    async def fetch_feed(self, feed_source: FeedSource, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    async def fetch_feed(self, feed_source: FeedSource, limit: Optional[int] = None) -> List[Article]:
         """
         获取单个RSS源的内容，与旧版本逻辑保持一致
 
@@ -45,51 +82,316 @@ class FeedManager:
         """
         cache_key = f"feed:{feed_source.url}"
 
-        # 检查缓存（简化版本，类似旧版本）
-        cached_data = await self.cache.get(cache_key)
+        # 检查缓存，过期但仍在stale-while-revalidate窗口内的数据直接返回并后台刷新
+        cached_data = await self.cache.get(
+            cache_key,
+            revalidate=lambda: self.refresh_feed(feed_source)
+        )
         if cached_data is not None:
             logger.debug(f"从缓存获取RSS源: {feed_source.name}")
-            return cached_data[:limit] if limit else cached_data
+            self._ensure_ingested(feed_source, cached_data)
+            return self.store.get_feed_articles(feed_source.url, limit)
 
         try:
-            logger.info(f"获取RSS源: {feed_source.name} ({feed_source.url})")
+            # 同一RSS源同时只进行一次下载和解析，并发调用者共享结果
+            await self.refresh_feed(feed_source)
+            return self.store.get_feed_articles(feed_source.url, limit)
+
+        except Exception as e:
+            # 源不可用时继续返回上次成功获取的数据
+            stale_data = await self.cache.get_stale(cache_key)
+            if stale_data is not None:
+                # 退避或熔断期间被跳过的请求不重复告警，只有实际请求失败时记录警告
+                if isinstance(e, FeedUnavailableError):
+                    logger.debug(f"跳过RSS源，返回缓存的旧数据: {feed_source.name} - {e}")
+                else:
+                    logger.warning(f"获取RSS源失败，返回缓存的旧数据: {feed_source.name} - {e}")
+                self._ensure_ingested(feed_source, stale_data)
+                return self.store.get_feed_articles(feed_source.url, limit)
+
+            if isinstance(e, FeedUnavailableError):
+                logger.debug(f"跳过RSS源: {feed_source.name} - {e}")
+            else:
+                logger.error(f"获取RSS源失败: {feed_source.name} - {e}")
+            return []
+
+    async def refresh_feed(self, feed_source: FeedSource) -> FeedRefreshResult:
+        """
+        强制刷新单个RSS源（供后台刷新使用），与并发的按需刷新合并
+
+        Args:
+            feed_source: RSS源配置
+
+        Returns:
+            刷新结果
+
+        Raises:
+            Exception: 下载或解析失败
+        """
+        return await self._inflight.do(
+            f"feed:{feed_source.url}",
+            lambda: self._refresh_feed(feed_source)
+        )
+
+    def set_feed_ttl(self, feed_url: str, ttl: float) -> None:
+        """
+        设置RSS源的缓存时间（后台刷新按轮询间隔延长缓存）
+
+        Args:
+            feed_url: RSS源地址
+            ttl: 缓存时间（秒）
+        """
+        self._ttl_overrides[feed_url] = ttl
+
+    def _ensure_ingested(self, feed_source: FeedSource, data: List[Any]) -> None:
+        """
+        缓存数据来自磁盘缓存层时（进程重启后，或其他工作进程写入了新数据），写入文章存储
+        """
+        if self.store.has_feed(feed_source.url) and (not data or isinstance(data[0], Article)):
+            return
+        self.store.ingest(feed_source.url, self._as_articles(feed_source, data))
+        # 缓存条目改为引用存储中的文章，之后命中时不再重复写入
+        data[:] = self.store.get_feed_articles(feed_source.url)
+
+    @staticmethod
+    def _as_articles(feed_source: FeedSource, data: List[Any]) -> List[Article]:
+        """磁盘缓存层恢复的数据为字典，转换为文章"""
+        return [
+            item if isinstance(item, Article) else Article.from_dict(item, feed_source)
+            for item in data
+        ]
+
+    def set_follower_check(self, check: Callable[[], bool]) -> None:
+        """
+        设置本进程是否由其他进程负责刷新的判断（多进程模式下未当选的工作进程）
 
-            # 在线程池中执行RSS解析（避免阻塞）
-            loop = asyncio.get_event_loop()
-            feed = await loop.run_in_executor(None, feedparser.parse, feed_source.url)
+        判断为真时刷新RSS源不请求上游，而是等待刷新进程写入共享的磁盘缓存
 
-            # 添加网络诊断信息
-            if hasattr(feed, 'status'):
-                logger.debug(f"RSS响应状态: {feed.status}")
-            if hasattr(feed, 'headers') and feed.headers:
-                try:
-                    logger.debug(f"RSS响应头: {dict(feed.headers)}")
-                except Exception:
-                    logger.debug(f"RSS响应头: {feed.headers}")
+        Args:
+            check: 返回本进程当前是否只从共享磁盘缓存读取
+        """
+        self._follower_check = check
 
-            if feed.bozo:
-                logger.warning(f"RSS源解析警告: {feed_source.name} - {feed.bozo_exception}")
+    def _feed_ttl(self, feed_url: str) -> int:
+        """获取RSS源的缓存时间"""
+        return int(max(self.config.cache_duration, self._ttl_overrides.get(feed_url, 0)))
 
-            articles = []
-            max_articles = limit or 20  # 类似旧版本的 MAX_ARTICLE_LIMIT
+    async def _refresh_feed(self, feed_source: FeedSource) -> FeedRefreshResult:
+        """
+        从网络刷新单个RSS源，写入文章存储和缓存；
+        多进程模式下的非刷新进程先等待刷新进程写入共享磁盘缓存，只有没有任何数据时才自行获取
 
-            for entry in feed.entries[:max_articles]:
-                article = self._parse_entry(entry, feed_source.name)
-                if article:
-                    article["feed_url"] = feed_source.url
-                    articles.append(article)
+        Args:
+            feed_source: RSS源配置
 
-            # 缓存结果
-            await self.cache.set(cache_key, articles, self.config.cache_duration)
+        Returns:
+            刷新结果
 
-            logger.info(f"成功获取 {len(articles)} 篇文章从 {feed_source.name}")
-            return articles[:limit] if limit else articles
+        Raises:
+            FeedUnavailableError: 源处于退避或熔断状态，或（非刷新进程）刷新进程尚未写入新数据
+            Exception: 下载或解析失败
+        """
+        # 源处于退避或熔断状态时不发起请求（非刷新进程也不再等待共享数据）
+        self.health.check(feed_source)
 
+        try:
+            result = None
+            if self._follower_check is not None and self._follower_check():
+                result = await self._wait_for_shared(feed_source)
+                if result is None and await self.cache.get_entry(f"feed:{feed_source.url}") is not None:
+                    # 已有旧数据时不自行请求上游，由调用方返回旧数据
+                    raise FeedUnavailableError("刷新进程尚未写入新数据")
+            if result is None:
+                result = await self._fetch_and_store(feed_source)
         except Exception as e:
-            logger.error(f"获取RSS源失败: {feed_source.name} - {e}")
-            return []
-    
-    async def fetch_feeds_by_category(self, category: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+            self.health.record_failure(feed_source, e)
+            raise
+
+        self.health.record_success(feed_source)
+        return result
+
+    async def _wait_for_shared(self, feed_source: FeedSource) -> Optional[FeedRefreshResult]:
+        """
+        等待刷新进程把RSS源的新数据写入共享磁盘缓存（最多等待一次下载的超时时间）
+
+        Args:
+            feed_source: RSS源配置
+
+        Returns:
+            刷新结果，超时未写入时返回None
+        """
+        cache_key = f"feed:{feed_source.url}"
+        deadline = time.monotonic() + self.fetcher.timeout
+        while not await self.cache.reload(cache_key):
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(_SHARED_POLL_INTERVAL)
+
+        entry = await self.cache.get_entry(cache_key)
+        if entry is None:
+            return None
+        generation = self.store.generation
+        self._ensure_ingested(feed_source, entry.data)
+        return FeedRefreshResult(
+            self.store.get_feed_articles(feed_source.url),
+            changed=self.store.generation != generation
+        )
+
+    async def _fetch_and_store(self, feed_source: FeedSource) -> FeedRefreshResult:
+        """
+        下载并解析单个RSS源，写入文章存储和缓存
+
+        Args:
+            feed_source: RSS源配置
+
+        Returns:
+            刷新结果
+
+        Raises:
+            Exception: 下载或解析失败
+        """
+        cache_key = f"feed:{feed_source.url}"
+        entry = await self.cache.get_entry(cache_key)
+
+        logger.info(f"获取RSS源: {feed_source.name} ({feed_source.url})")
+
+        # 通过共享连接池异步下载，已有缓存时发送条件请求
+        fetch_start = time.perf_counter()
+        try:
+            result = await self.fetcher.fetch(
+                feed_source.url,
+                etag=entry.etag if entry else None,
+                last_modified=entry.last_modified if entry else None
+            )
+        except httpx.HTTPStatusError as e:
+            self.metrics.feed_responses.inc(feed_source.name, str(e.response.status_code))
+            raise
+        except Exception:
+            self.metrics.feed_responses.inc(feed_source.name, "error")
+            raise
+        finally:
+            self.metrics.feed_fetch_duration.observe(time.perf_counter() - fetch_start, feed_source.name)
+        self.metrics.feed_responses.inc(feed_source.name, str(result.status))
+        self.metrics.feed_bytes.inc(feed_source.name, amount=len(result.content))
+
+        # 添加网络诊断信息
+        logger.debug(f"RSS响应状态: {result.status}")
+        logger.debug(f"RSS响应头: {result.headers}")
+
+        # 内容未变化：延长现有缓存条目的生存时间，跳过解析
+        if result.not_modified and entry is not None:
+            await self.cache.refresh(cache_key, self._feed_ttl(feed_source.url))
+            self._ensure_ingested(feed_source, entry.data)
+            logger.info(f"RSS源未变化(304): {feed_source.name}")
+            return FeedRefreshResult(
+                self.store.get_feed_articles(feed_source.url),
+                changed=False,
+                poll_hint=result.max_age
+            )
+
+        # 在线程池或进程池中解析已下载的内容（避免阻塞）
+        parse_start = time.perf_counter()
+        feed = await self.parser.parse(result.content, result.headers, self.config.max_articles)
+        self.metrics.feed_parse_duration.observe(time.perf_counter() - parse_start, feed_source.name)
+
+        if feed.bozo:
+            logger.warning(f"RSS源解析警告: {feed_source.name} - {feed.bozo}")
+
+        # 完整解析一次（最多max_articles篇），各调用按需从存储中切片；
+        # 未变化的条目复用存储中的文章，索引只更新变化的部分
+        parsed = [self._make_article(feed_source, entry) for entry in feed.entries]
+
+        delta = self.store.ingest(feed_source.url, parsed)
+        articles = self.store.get_feed_articles(feed_source.url)
+
+        # 缓存结果及HTTP校验值
+        await self.cache.set(
+            cache_key,
+            articles,
+            self._feed_ttl(feed_source.url),
+            etag=result.etag,
+            last_modified=result.last_modified
+        )
+
+        logger.info(
+            f"成功获取 {len(articles)} 篇文章从 {feed_source.name}"
+            f"（新增 {len(delta.added)}，更新 {len(delta.updated)}，移除 {len(delta.removed)}）"
+        )
+
+        # 与上一版本的差异供后台刷新估算更新频率
+        hints = [h for h in (result.max_age, feed.poll_hint) if h]
+        return FeedRefreshResult(articles, changed=delta.changed, poll_hint=max(hints) if hints else None)
+
+    def _make_article(self, feed_source: FeedSource, entry: EntryTuple) -> Article:
+        """
+        由解析得到的条目元组生成文章
+
+        guid/链接与存储中的文章相同且内容未变化时直接返回原文章；发布时间字符串未变化时沿用原时间戳，
+        没有发布时间的条目因此保留首次出现的时间，不会在每次刷新时排到最前。
+
+        Args:
+            feed_source: RSS源配置
+            entry: 条目元组
+
+        Returns:
+            文章
+        """
+        guid, title, link, summary, published, published_timestamp = entry
+        article_id = make_article_id(feed_source.url, guid, link, title, published)
+
+        previous = self.store.get(article_id)
+        if previous is not None and previous.published == published:
+            if (previous.title == title and previous.link == link and previous.summary == summary
+                    and previous.feed is feed_source):
+                return previous
+            published_timestamp = previous.published_timestamp
+
+        return Article(
+            article_id,
+            title,
+            link,
+            summary,
+            published,
+            published_timestamp,
+            feed_source
+        )
+
+    def _all_feed_sources(self) -> List[FeedSource]:
+        """获取所有分类中去重后的RSS源"""
+        feeds: Dict[str, FeedSource] = {}
+        for category_feeds in self.config.categories.values():
+            for feed in category_feeds:
+                feeds.setdefault(feed.url, feed)
+        return list(feeds.values())
+
+    async def fetch_many(self, feeds: List[FeedSource], limit: Optional[int] = None) -> List[Tuple[FeedSource, List[Article]]]:
+        """
+        并发获取多个RSS源的内容
+
+        所有源同时发起，实际的网络并发由抓取器的全局和单主机限制控制，
+        总耗时取决于最慢的源而不是各源耗时之和。
+
+        Args:
+            feeds: RSS源列表
+            limit: 每个源的文章数量限制
+
+        Returns:
+            (RSS源, 文章列表) 列表，获取失败的源不包含在内
+        """
+        results = await asyncio.gather(
+            *(self.fetch_feed(feed, limit) for feed in feeds),
+            return_exceptions=True
+        )
+
+        fetched = []
+        for feed, result in zip(feeds, results):
+            if isinstance(result, Exception):
+                logger.error(f"获取RSS源失败: {feed.name} - {result}")
+            else:
+                fetched.append((feed, result))
+        return fetched
+
+    async def fetch_feeds_by_category(self, category: str, limit: Optional[int] = None) -> List[Article]:
         """
         根据分类获取RSS源内容
         
@@ -105,32 +407,10 @@ class FeedManager:
             logger.warning(f"未找到分类: {category}")
             return []
         
-        # 限制并发请求数量
-        max_feeds = min(len(feeds), self.config.max_feeds_per_request)
-        selected_feeds = feeds[:max_feeds]
-        
-        # 并发获取多个RSS源
-        tasks = [
-            self.fetch_feed(feed, limit)
-            for feed in selected_feeds
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 合并结果
-        all_articles = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"获取RSS源失败: {selected_feeds[i].name} - {result}")
-            else:
-                all_articles.extend(result)
-        
-        # 按发布时间排序
-        all_articles.sort(key=lambda x: x.get('published_timestamp', 0), reverse=True)
-        
-        return all_articles[:limit] if limit else all_articles
+        results = await self.fetch_many(feeds, limit)
+        return self._read_timeline(category, results, limit)
     
-    async def fetch_all_feeds(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    async def fetch_all_feeds(self, limit: Optional[int] = None) -> List[Article]:
         """
         获取所有RSS源的内容
 
@@ -140,70 +420,55 @@ class FeedManager:
         Returns:
             文章列表
         """
-        all_articles = []
+        results = await self.fetch_many(self._all_feed_sources(), limit)
+        return self._read_timeline(None, results, limit)
 
-        for category in self.config.categories.keys():
-            articles = await self.fetch_feeds_by_category(category, limit)
-            all_articles.extend(articles)
-
-        # 按发布时间排序并限制数量
-        all_articles.sort(key=lambda x: x.get('published_timestamp', 0), reverse=True)
+    def _read_timeline(self, category: Optional[str], results: List[Tuple[FeedSource, List[Article]]],
+                       limit: Optional[int] = None) -> List[Article]:
+        """
+        从写入时维护的时间线读取最新文章，不再逐次合并排序
 
-        return all_articles[:limit] if limit else all_articles
+        Args:
+            category: 分类名称，None表示全部RSS源
+            results: 本次获取的结果，没有返回文章的源（不可用且无旧数据）不包含在结果中
+            limit: 文章数量限制
 
-    async def fetch_all_feeds_balanced(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        Returns:
+            按发布时间降序排列的文章列表
         """
-        平衡地从所有RSS源获取内容，每个源随机取1-2条文章
+        available = {feed.url for feed, articles in results if articles}
+        # 所有源都有数据时直接切片，否则跳过不可用源的文章
+        feeds = None if len(available) == len(results) else available
+        articles = (self.store.get(article_id) for article_id in self.timelines.latest(category, limit, feeds))
+        return [article for article in articles if article is not None]
+
+    async def fetch_all_feeds_balanced(self, limit: Optional[int] = None,
+                                       seed: Optional[int] = None) -> List[Article]:
+        """
+        平衡地从所有RSS源获取内容，每个源按配额随机选取少量文章
 
         Args:
             limit: 文章数量限制
+            seed: 随机种子，指定时相同数据下的结果可复现
 
         Returns:
             文章列表
         """
-        all_articles = []
-
-        # 收集所有RSS源
-        all_feeds = []
-        for category_feeds in self.config.categories.values():
-            all_feeds.extend(category_feeds)
-
-        # 随机打乱源的顺序，增加多样性
-        random.shuffle(all_feeds)
-
-        # 并发获取所有源的内容
-        tasks = []
-        for feed in all_feeds:
-            # 每个源获取更多文章，后面再随机选择
-            tasks.append(self.fetch_feed(feed, 10))
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # 从每个源随机选择1-2篇文章
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"获取RSS源失败: {all_feeds[i].name} - {result}")
-                continue
-
-            if result and isinstance(result, list) and len(result) > 0:  # 如果有文章
-                # 随机选择1-2篇文章
-                num_articles = min(random.randint(1, 2), len(result))
-                selected_articles = random.sample(result, num_articles)
-                all_articles.extend(selected_articles)
-
-        # 按发布时间排序
-        all_articles.sort(key=lambda x: x.get('published_timestamp', 0), reverse=True)
-
-        # 限制最终数量
-        return all_articles[:limit] if limit else all_articles
-
-    async def fetch_feeds_by_category_balanced(self, category: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        feeds = self._all_feed_sources()
+        # 配额为0的源不参与选取，也不需要获取
+        feeds = [feed for feed in feeds if self.sampler.quota(feed) > 0]
+        unavailable = await self._ensure_fresh(feeds)
+        return self.sampler.sample(feeds, limit, seed, exclude=unavailable)
+
+    async def fetch_feeds_by_category_balanced(self, category: str, limit: Optional[int] = None,
+                                               seed: Optional[int] = None) -> List[Article]:
         """
-        平衡地根据分类获取RSS源内容，每个源随机取1-2条文章
+        平衡地根据分类获取RSS源内容，每个源按配额随机选取少量文章
 
         Args:
             category: 分类名称
             limit: 文章数量限制
+            seed: 随机种子，指定时相同数据下的结果可复现
 
         Returns:
             文章列表
@@ -213,112 +478,109 @@ class FeedManager:
             logger.warning(f"未找到分类: {category}")
             return []
 
-        # 随机打乱源的顺序
-        feeds_shuffled = feeds.copy()
-        random.shuffle(feeds_shuffled)
-
-        # 并发获取所有源的内容
-        tasks = []
-        for feed in feeds_shuffled:
-            # 每个源获取更多文章，后面再随机选择
-            tasks.append(self.fetch_feed(feed, 10))
+        # 配额为0的源不参与选取，也不需要获取
+        feeds = [feed for feed in feeds if self.sampler.quota(feed) > 0]
+        unavailable = await self._ensure_fresh(feeds)
+        return self.sampler.sample(feeds, limit, seed, exclude=unavailable)
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # 从每个源随机选择1-2篇文章
-        all_articles = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"获取RSS源失败: {feeds_shuffled[i].name} - {result}")
-                continue
+    async def _ensure_fresh(self, feeds: List[FeedSource]) -> Set[str]:
+        """
+        确保RSS源已写入文章存储：缓存未过期的源直接使用存储中的文章，
+        其余的源通过fetch_feed获取（包括后台刷新和失败时返回旧数据）
 
-            if result and isinstance(result, list) and len(result) > 0:  # 如果有文章
-                # 随机选择1-2篇文章
-                num_articles = min(random.randint(1, 2), len(result))
-                selected_articles = random.sample(result, num_articles)
-                all_articles.extend(selected_articles)
+        Args:
+            feeds: RSS源列表
 
-        # 按发布时间排序
-        all_articles.sort(key=lambda x: x.get('published_timestamp', 0), reverse=True)
+        Returns:
+            本次没有可用文章的RSS源地址
+        """
+        stale = []
+        for feed in feeds:
+            data = self.cache.get_fresh(f"feed:{feed.url}")
+            if data is None:
+                stale.append(feed)
+            else:
+                self._ensure_ingested(feed, data)
+        if not stale:
+            return set()
 
-        # 限制最终数量
-        return all_articles[:limit] if limit else all_articles
+        results = await self.fetch_many(stale, 1)
+        available = {feed.url for feed, articles in results if articles}
+        return {feed.url for feed in stale if feed.url not in available}
     
-    def search_articles(self, articles: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+    def feeds_fresh(self, feeds: Optional[List[FeedSource]] = None) -> bool:
         """
-        在文章中搜索关键词
-        
+        可刷新的RSS源的缓存是否都未过期
+
+        工具响应缓存命中前检查：有源需要刷新时应走正常获取流程，以触发后台刷新或重新获取。
+        处于退避或熔断中的源、以及从未成功获取过的源本次不会被刷新，不影响判断，
+        避免单个失效的源使工具响应缓存一直无法命中
+
         Args:
-            articles: 文章列表
-            query: 搜索关键词
-            
+            feeds: RSS源列表，None表示全部RSS源
+
         Returns:
-            匹配的文章列表
+            是否没有需要刷新的源
         """
-        query_lower = query.lower()
-        matched_articles = []
-        
-        for article in articles:
-            # 在标题、摘要和内容中搜索
-            title = article.get('title', '').lower()
-            summary = article.get('summary', '').lower()
-            content = article.get('content', '').lower()
-            
-            if (query_lower in title or 
-                query_lower in summary or 
-                query_lower in content):
-                matched_articles.append(article)
-        
-        return matched_articles
-    
-    def _parse_entry(self, entry: Any, feed_name: str) -> Optional[Dict[str, Any]]:
+        if feeds is None:
+            feeds = self._all_feed_sources()
+        return not any(self._needs_refresh(feed) for feed in feeds)
+
+    def _needs_refresh(self, feed_source: FeedSource) -> bool:
+        """RSS源的缓存已过期且当前可以刷新"""
+        key = f"feed:{feed_source.url}"
+        return self.cache.contains(key) and not self.cache.is_fresh(key) \
+            and self.health.is_available(feed_source)
+
+    def balanced_feeds_fresh(self, category: Optional[str] = None) -> bool:
         """
-        解析RSS条目，与旧版本保持一致
+        平衡选取涉及的RSS源（配额大于0）是否没有需要刷新的源（见feeds_fresh）
 
         Args:
-            entry: RSS条目
-            feed_name: RSS源名称
+            category: 分类名称，None表示全部RSS源
 
         Returns:
-            解析后的文章信息
+            是否没有需要刷新的源
         """
-        try:
-            # 解析发布时间
-            published_str = getattr(entry, 'published', 'No date available')
-            published_timestamp = 0
-
-            if published_str != 'No date available':
-                try:
-                    # 尝试解析RSS时间格式
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        published_timestamp = time.mktime(entry.published_parsed)
-                    else:
-                        # 尝试使用email.utils解析
-                        dt = parsedate_to_datetime(published_str)
-                        published_timestamp = dt.timestamp()
-                except Exception as e:
-                    logger.debug(f"解析时间失败 {published_str}: {e}")
-                    # 使用当前时间作为后备
-                    published_timestamp = time.time()
-            else:
-                # 如果没有时间信息，使用当前时间
-                published_timestamp = time.time()
+        feeds = self.config.categories.get(category, []) if category else self._all_feed_sources()
+        return self.feeds_fresh([feed for feed in feeds if self.sampler.quota(feed) > 0])
 
-            article = {
-                "title": getattr(entry, 'title', '无标题'),
-                "link": getattr(entry, 'link', ''),
-                "summary": getattr(entry, 'summary', 'No summary available'),
-                "published": published_str,
-                "published_timestamp": published_timestamp,
-                "source": feed_name,
-                "feed_url": ""  # 这个会在调用时设置
-            }
-
-            return article
+    async def load_all_feeds(self) -> None:
+        """确保所有RSS源已加载到文章存储（缓存命中时不产生网络请求）"""
+        await self.fetch_many(self._all_feed_sources())
+    
+    def search_articles(self, query: str, limit: Optional[int] = None) -> List[Article]:
+        """
+        通过倒排索引搜索文章，按BM25相关度排序
+        
+        Args:
+            query: 搜索关键词，双引号括起的内容按短语匹配
+            limit: 结果数量限制
+            
+        Returns:
+            匹配的文章列表
+        """
+        results = self.search_index.search(query, limit)
+        articles = (self.store.get(doc_id) for doc_id, _ in results)
+        return [article for article in articles if article is not None]
+    
+    def get_fetch_stats(self) -> Dict[str, int]:
+        """获取RSS源刷新的请求合并统计"""
+        return self._inflight.get_stats()
 
-        except Exception as e:
-            logger.error(f"解析RSS条目失败: {e}")
-            return None
+    def get_health_stats(self) -> Dict[str, Any]:
+        """获取RSS源熔断状态"""
+        return self.health.get_stats()
+    
+    def get_store_stats(self) -> Dict[str, Any]:
+        """获取文章存储统计"""
+        stats = self.store.get_stats()
+        stats["parser"] = self.parser.get_stats()
+        stats["search_index"] = self.search_index.get_stats()
+        stats["url_index"] = len(self.url_index)
+        stats["timeline"] = len(self.timelines)
+        stats["sampling"] = self.sampler.get_stats()
+        return stats
     
     def get_available_categories(self) -> List[str]:
         """获取可用的分类列表"""
@@ -332,7 +594,7 @@ class FeedManager:
         """获取所有RSS源"""
         return self.config.categories
 
-    async def get_article_details(self, url: str) -> Optional[Dict[str, Any]]:
+    async def get_article_details(self, url: str) -> Optional[Article]:
         """
         通过URL获取文章详细信息
 
@@ -343,13 +605,17 @@ class FeedManager:
             文章详细信息，如果未找到则返回None
         """
         try:
-            # 从所有缓存的文章中查找
-            all_articles = await self.fetch_all_feeds()
-
-            # 查找匹配的文章
-            for article in all_articles:
-                if article.get('link') == url:
-                    return article
+            # 首次查找时加载全部RSS源，之后只在有源的缓存过期时重新加载（并发请求合并），
+            # 没有后台刷新（或不是刷新进程）时也能找到新发布的文章；缓存未过期时只读内存
+            if not self._all_loaded or not self.feeds_fresh():
+                await self._inflight.do("load:all", self.load_all_feeds)
+                self._all_loaded = True
+
+            # 通过规范化URL索引查找
+            article_id = self.url_index.get(url)
+            article = self.store.get(article_id) if article_id else None
+            if article is not None:
+                return article
 
             logger.warning(f"未找到URL对应的文章: {url}")
             return None
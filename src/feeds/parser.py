@@ -0,0 +1,576 @@
+"""
+RSS解析模块
+在线程池或进程池中解析已下载的RSS内容（规范文档走流式快速路径），返回紧凑的条目元组
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from xml.parsers import expat
+
+import feedparser
+
+try:
+    # 快速解析路径复用feedparser的内部函数，保证输出与完整解析一致
+    from feedparser.datetimes import _parse_date
+    from feedparser.html import _cp1252
+    from feedparser.mixin import _FeedParserMixin
+    from feedparser.sanitizer import _sanitize_html
+    from feedparser.urls import _urljoin
+    _FAST_PATH_AVAILABLE = True
+    _FAST_PATH_ERROR = None
+except ImportError as e:
+    # 依赖的内部函数在feedparser新版本中可能改名，此时只能使用完整解析（见FeedParser初始化时的警告）
+    _FAST_PATH_AVAILABLE = False
+    _FAST_PATH_ERROR = str(e)
+
+
+logger = logging.getLogger(__name__)
+
+# sy:updatePeriod 对应的秒数
+_UPDATE_PERIOD_SECONDS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 604800,
+    "monthly": 2592000,
+    "yearly": 31536000,
+}
+
+# 条目元组：(guid, 标题, 链接, 摘要, 发布时间字符串, 发布时间戳)
+EntryTuple = Tuple[Optional[str], str, str, str, str, float]
+
+
+# 快速解析路径支持的命名空间
+_ATOM_NS = "http://www.w3.org/2005/Atom"
+_CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+_DC_NS = "http://purl.org/dc/elements/1.1/"
+_DCTERMS_NS = "http://purl.org/dc/terms/"
+_SY_NS = "http://purl.org/rss/1.0/modules/syndication/"
+_ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+_MEDIA_NS = "http://search.yahoo.com/mrss/"
+_SLASH_NS = "http://purl.org/rss/1.0/modules/slash/"
+_WFW_NS = "http://wellformedweb.org/CommentAPI/"
+
+# (命名空间, 元素名) -> 条目字段
+_RSS_ITEM_FIELDS = {
+    ("", "title"): "title",
+    ("", "link"): "link",
+    ("", "description"): "summary",
+    ("", "guid"): "id",
+    ("", "pubDate"): "published",
+    (_CONTENT_NS, "encoded"): "content",
+    (_DC_NS, "title"): "title",
+    (_DC_NS, "description"): "summary",
+    (_DCTERMS_NS, "issued"): "published",
+}
+# feedparser对这些字段保留第一次出现的值（如同时有title和dc:title时），其余字段以最后一次为准
+_FIRST_VALUE_FIELDS = {"title", "summary", "content"}
+_ATOM_ENTRY_FIELDS = {
+    (_ATOM_NS, "title"): "title",
+    (_ATOM_NS, "summary"): "summary",
+    (_ATOM_NS, "content"): "content",
+    (_ATOM_NS, "id"): "id",
+    (_ATOM_NS, "published"): "published",
+    (_ATOM_NS, "issued"): "published",
+}
+# 条目中可以忽略的命名空间元素（feedparser不会将其用于标题、链接、摘要、正文、ID和发布时间），
+# 条目内其他命名空间的元素（如RSS中的atom:link、itunes:summary、media:title）交给feedparser处理
+_IGNORED_ENTRY_ELEMENTS = {
+    _DC_NS: {"creator", "subject", "contributor", "publisher", "rights", "language", "date",
+             "format", "type", "identifier", "source", "relation", "coverage"},
+    _DCTERMS_NS: {"created", "modified", "valid"},
+    _ITUNES_NS: {"author", "duration", "explicit", "image", "episode", "episodeType", "season",
+                 "keywords", "block", "subtitle", "order", "closedCaptioned"},
+    _MEDIA_NS: {"content", "thumbnail", "category", "keywords", "credit", "rating", "player",
+                "license", "restriction", "hash"},
+    _MEDIA_NS.rstrip("/"): {"content", "thumbnail", "category", "keywords", "credit", "rating", "player",
+                            "license", "restriction", "hash"},
+    _SLASH_NS: {"comments", "section", "department", "hit_parade"},
+    _WFW_NS: {"comment", "commentRss"},
+}
+_CHANNEL_FIELDS = {
+    ("", "ttl"): "ttl",
+    (_SY_NS, "updatePeriod"): "sy_updateperiod",
+    (_SY_NS, "updateFrequency"): "sy_updatefrequency",
+}
+# RSS中默认按HTML处理的字段（其余按纯文本，内容像HTML时再按HTML处理）
+_RSS_HTML_FIELDS = {"summary", "content"}
+_ATOM_TYPES = {"text": "text/plain", "html": "text/html"}
+
+_XML_DECL_RE = re.compile(rb'^\s*<\?xml[^>]*encoding=["\']([\w.:-]+)["\']')
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.I)
+_ENTITY_IN_LINK_RE = re.compile("&([A-Za-z0-9_]+);")
+_CHUNK_SIZE = 65536
+
+
+class ParsedFeed(NamedTuple):
+    """解析结果（可在进程间传递）"""
+    entries: List[EntryTuple]
+    poll_hint: Optional[float]  # 源声明的建议刷新间隔（秒）
+    bozo: Optional[str]  # 解析警告
+    fast_path: bool = False  # 是否由快速解析路径完成
+
+
+def parse_entry(entry: Any) -> Optional[EntryTuple]:
+    """
+    解析RSS条目，与旧版本保持一致
+
+    Args:
+        entry: feedparser解析的条目
+
+    Returns:
+        条目元组，解析失败时返回None
+    """
+    try:
+        published_str = getattr(entry, 'published', 'No date available')
+        return (
+            getattr(entry, 'id', None),
+            getattr(entry, 'title', '无标题'),
+            getattr(entry, 'link', ''),
+            getattr(entry, 'summary', 'No summary available'),
+            published_str,
+            _published_timestamp(published_str, getattr(entry, 'published_parsed', None))
+        )
+
+    except Exception as e:
+        logger.error(f"解析RSS条目失败: {e}")
+        return None
+
+
+def _published_timestamp(published_str: str, published_parsed: Optional[time.struct_time]) -> float:
+    """
+    计算发布时间戳，与旧版本保持一致
+
+    Args:
+        published_str: 发布时间字符串
+        published_parsed: feedparser解析的发布时间
+
+    Returns:
+        发布时间戳，无法解析时为当前时间
+    """
+    if published_str == 'No date available':
+        # 如果没有时间信息，使用当前时间
+        return time.time()
+
+    try:
+        # 尝试解析RSS时间格式
+        if published_parsed:
+            return time.mktime(published_parsed)
+        # 尝试使用email.utils解析
+        return parsedate_to_datetime(published_str).timestamp()
+    except Exception as e:
+        logger.debug(f"解析时间失败 {published_str}: {e}")
+        # 使用当前时间作为后备
+        return time.time()
+
+
+def feed_poll_hint(feed_info: Any) -> Optional[float]:
+    """
+    从RSS的<ttl>和sy:updatePeriod/sy:updateFrequency中读取建议的刷新间隔
+
+    Args:
+        feed_info: feedparser解析的频道信息
+
+    Returns:
+        建议的刷新间隔（秒），未声明时返回None
+    """
+    try:
+        ttl = feed_info.get('ttl')
+        if ttl:
+            return int(ttl) * 60
+
+        period = feed_info.get('sy_updateperiod')
+        if period in _UPDATE_PERIOD_SECONDS:
+            frequency = int(feed_info.get('sy_updatefrequency') or 1)
+            return _UPDATE_PERIOD_SECONDS[period] / max(frequency, 1)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class _Unsupported(Exception):
+    """文档不在快速解析路径的支持范围内"""
+
+
+class _Done(Exception):
+    """已取得足够的条目，停止解析"""
+
+
+class _FastFeedParser:
+    """
+    RSS 2.0 / Atom 1.0 的流式解析器
+
+    基于expat按块增量解析，只提取文章所需的字段，取得max_articles个条目后立即停止；
+    字段的后处理（HTML判断与清理、链接修正）与feedparser一致。
+    """
+
+    def __init__(self, max_articles: int):
+        self.max_articles = max_articles
+        self.entries: List[EntryTuple] = []
+        self.channel: Dict[str, str] = {}
+        self._atom = False
+        self._depth = 0
+        self._entry: Optional[Dict[str, Any]] = None
+        self._entry_depth = 0
+        self._field: Optional[str] = None
+        self._field_type = ""
+        self._field_depth = 0
+        self._text: List[str] = []
+
+    def parse(self, content: bytes) -> None:
+        parser = expat.ParserCreate(namespace_separator=" ")
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._data
+        # 文档类型声明可能定义实体，交给feedparser处理
+        parser.StartDoctypeDeclHandler = self._unsupported
+
+        try:
+            for offset in range(0, len(content), _CHUNK_SIZE):
+                parser.Parse(content[offset:offset + _CHUNK_SIZE], False)
+            parser.Parse(b"", True)
+        except _Done:
+            pass
+
+    @staticmethod
+    def _unsupported(*args: Any) -> None:
+        raise _Unsupported()
+
+    def _start(self, name: str, attrs: Dict[str, str]) -> None:
+        self._depth += 1
+        ns, _, local = name.rpartition(" ")
+        if any(key.startswith("http://www.w3.org/XML/1998/namespace ") for key in attrs):
+            # xml:base/xml:lang会改变链接解析和内容含义
+            raise _Unsupported()
+
+        if self._depth == 1:
+            if (ns, local) == (_ATOM_NS, "feed"):
+                self._atom = True
+            elif (ns, local) != ("", "rss"):
+                raise _Unsupported()
+            return
+
+        if self._field is not None:
+            # 字段中包含子元素（如xhtml内容），交给feedparser处理
+            raise _Unsupported()
+
+        if self._entry is None:
+            if (ns, local) in ((_ATOM_NS, "entry"), ("", "item")):
+                self._entry = {}
+                self._entry_depth = self._depth
+            elif (ns, local) in _CHANNEL_FIELDS:
+                self._begin_field(_CHANNEL_FIELDS[(ns, local)], "")
+            return
+
+        child = self._depth == self._entry_depth + 1
+        if ns and ns != (_ATOM_NS if self._atom else "") and local not in _IGNORED_ENTRY_ELEMENTS.get(ns, ()):
+            # 条目中的其他命名空间元素：只处理已映射的直接子元素，其余交给feedparser处理
+            if not (child and not self._atom and (ns, local) in _RSS_ITEM_FIELDS):
+                raise _Unsupported()
+
+        if not child:
+            return
+
+        if self._atom:
+            if (ns, local) == (_ATOM_NS, "link"):
+                if (attrs.get("rel", "alternate") == "alternate"
+                        and attrs.get("type", "text/html") in ("text/html", "application/xhtml+xml")
+                        and "href" in attrs):
+                    self._entry["link"] = _urljoin("", attrs["href"])
+                return
+            field = _ATOM_ENTRY_FIELDS.get((ns, local))
+            if field is None:
+                return
+            field_type = ""
+            if field in ("title", "summary", "content"):
+                field_type = _ATOM_TYPES.get(attrs.get("type", "text"))
+                if field_type is None:
+                    raise _Unsupported()
+                if field == "content" and "src" in attrs:
+                    return
+            self._begin_field(field, field_type)
+        else:
+            field = _RSS_ITEM_FIELDS.get((ns, local))
+            if field is None:
+                return
+            if field == "id":
+                self._entry["guidislink"] = attrs.get("isPermaLink", "true") == "true"
+            self._begin_field(field, "text/html" if field in _RSS_HTML_FIELDS else "text/plain")
+
+    def _begin_field(self, field: str, field_type: str) -> None:
+        self._field = field
+        self._field_type = field_type
+        self._field_depth = self._depth
+        self._text = []
+
+    def _data(self, data: str) -> None:
+        if self._field is not None:
+            self._text.append(data)
+
+    def _end(self, name: str) -> None:
+        if self._field is not None and self._depth == self._field_depth:
+            value = "".join(self._text).strip()
+            if self._entry is None:
+                self.channel[self._field] = value
+            elif self._field not in _FIRST_VALUE_FIELDS or self._field not in self._entry:
+                self._entry[self._field] = self._finish_field(self._field, value)
+            self._field = None
+        elif self._entry is not None and self._depth == self._entry_depth:
+            self.entries.append(self._make_entry(self._entry))
+            self._entry = None
+            if len(self.entries) >= self.max_articles:
+                raise _Done()
+        self._depth -= 1
+
+    def _finish_field(self, field: str, value: str) -> str:
+        """按feedparser的规则处理字段值"""
+        if field == "link":
+            value = _urljoin("", value).replace("&amp;", "&")
+            value = _ENTITY_IN_LINK_RE.sub(r"&\g<1>", value)
+        elif field == "id":
+            if self._atom or self._entry.get("guidislink"):
+                value = _urljoin("", value)
+        elif self._field_type:
+            field_type = self._field_type
+            if not self._atom and field_type == "text/plain" and _FeedParserMixin.looks_like_html(value):
+                field_type = "text/html"
+            if field_type == "text/html":
+                value = _sanitize_html(value, "utf-8", field_type)
+
+        # 与feedparser一致：修正被误按iso-8859-1重复编码的utf-8文本，并映射cp1252扩展字符
+        try:
+            value = value.encode("iso-8859-1").decode("utf-8")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            pass
+        return value.translate(_cp1252)
+
+    def _make_entry(self, entry: Dict[str, Any]) -> EntryTuple:
+        """生成条目元组，缺失字段的默认值与parse_entry一致"""
+        link = entry.get("link")
+        guid = entry.get("id")
+        if link is None and guid is not None and (self._atom or entry.get("guidislink")):
+            # guid（isPermaLink）或Atom的id在没有链接时充当链接
+            link = guid
+
+        summary = entry.get("summary", entry.get("content"))
+        published = entry.get("published")
+        published_parsed = _parse_date(published) if published is not None else None
+        if published is None:
+            published = 'No date available'
+
+        return (
+            guid,
+            entry.get("title", '无标题'),
+            link if link is not None else '',
+            summary if summary is not None else 'No summary available',
+            published,
+            _published_timestamp(published, published_parsed)
+        )
+
+
+def fast_parse_feed(content: bytes, headers: Dict[str, str], max_articles: int) -> Optional[ParsedFeed]:
+    """
+    快速解析格式规范的UTF-8 RSS 2.0/Atom 1.0文档，只读取前max_articles个条目
+
+    Args:
+        content: 下载的原始内容
+        headers: HTTP响应头
+        max_articles: 最多保留的条目数
+
+    Returns:
+        解析结果；文档不规范或超出支持范围（其他编码、RSS 1.0、xhtml内容、相对链接基址等）时返回None
+    """
+    if not _FAST_PATH_AVAILABLE or max_articles <= 0:
+        return None
+
+    # 只处理UTF-8文档，其他编码的检测规则交给feedparser
+    charset = _CHARSET_RE.search(headers.get("content-type", ""))
+    if charset and charset.group(1).lower() not in ("utf-8", "utf8"):
+        return None
+    declared = _XML_DECL_RE.match(content[:256])
+    if declared and declared.group(1).lower() not in (b"utf-8", b"utf8"):
+        return None
+    if content.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return None
+    # feedparser用Content-Location作为相对链接的基址
+    if "content-location" in headers:
+        return None
+
+    parser = _FastFeedParser(max_articles)
+    try:
+        parser.parse(content)
+    except Exception:
+        return None
+
+    return ParsedFeed(parser.entries, feed_poll_hint(parser.channel), None, fast_path=True)
+
+
+def parse_feed(content: bytes, headers: Dict[str, str], max_articles: int,
+               fast_path: bool = True) -> ParsedFeed:
+    """
+    解析RSS内容（在工作线程或工作进程中执行）
+
+    优先使用流式快速解析，文档不规范或不受支持时回退到feedparser完整解析。
+
+    Args:
+        content: 下载的原始内容
+        headers: HTTP响应头
+        max_articles: 最多保留的条目数
+        fast_path: 是否尝试快速解析
+
+    Returns:
+        解析结果
+    """
+    if fast_path:
+        result = fast_parse_feed(content, headers, max_articles)
+        if result is not None:
+            return result
+
+    feed = feedparser.parse(content, response_headers=headers)
+    entries = []
+    for item in feed.entries[:max_articles]:
+        entry = parse_entry(item)
+        if entry:
+            entries.append(entry)
+    bozo = str(feed.bozo_exception) if feed.bozo else None
+    return ParsedFeed(entries, feed_poll_hint(feed.feed), bozo)
+
+
+def _warm_up() -> int:
+    """工作进程预热：提前完成feedparser的导入和初始化"""
+    feedparser.parse(b'<?xml version="1.0"?><rss version="2.0"><channel><item><title>x</title></item></channel></rss>')
+    return os.getpid()
+
+
+class FeedParser:
+    """RSS解析器，支持线程池（默认）和进程池两种模式"""
+
+    THREAD = "thread"
+    PROCESS = "process"
+
+    def __init__(self, mode: str = THREAD, workers: int = 0, fast_path: bool = True):
+        """
+        初始化解析器
+
+        Args:
+            mode: 解析模式，thread使用事件循环默认线程池，process使用独立进程池绕开GIL
+            workers: 进程池大小，0表示CPU核数
+            fast_path: 是否优先使用流式快速解析
+        """
+        if mode not in (self.THREAD, self.PROCESS):
+            raise ValueError(f"不支持的解析模式: {mode}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[Executor] = None
+        if fast_path and not _FAST_PATH_AVAILABLE:
+            logger.warning(f"当前feedparser版本不支持快速解析路径，所有RSS源使用完整解析: {_FAST_PATH_ERROR}")
+        self.fast_path = fast_path
+        self._started = False
+        self.parses = 0
+        self.fast_parses = 0
+        self.pending = 0  # 已提交到执行器但未完成的解析任务数
+
+    def _get_executor(self) -> Optional[Executor]:
+        """获取执行器（线程模式返回None，即事件循环默认线程池）"""
+        if self.mode == self.PROCESS and self._executor is None:
+            # 使用spawn启动，避免在已有后台线程（磁盘缓存写入线程等）的进程中fork
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up
+            )
+        return self._executor
+
+    async def start(self) -> None:
+        """预热进程池，使首批解析不必等待工作进程启动（可重复调用）"""
+        executor = self._get_executor()
+        if executor is None or self._started:
+            return
+        self._started = True
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(
+            loop.run_in_executor(executor, _warm_up) for _ in range(self.workers)
+        ))
+        logger.info(f"解析进程池已就绪，共 {len(set(pids))} 个工作进程")
+
+    async def parse(self, content: bytes, headers: Dict[str, str], max_articles: int) -> ParsedFeed:
+        """
+        解析RSS内容
+
+        Args:
+            content: 下载的原始内容
+            headers: HTTP响应头
+            max_articles: 最多保留的条目数
+
+        Returns:
+            解析结果
+        """
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            result = await loop.run_in_executor(
+                self._get_executor(),
+                functools.partial(parse_feed, content, headers, max_articles, self.fast_path)
+            )
+        finally:
+            self.pending -= 1
+        self.parses += 1
+        if result.fast_path:
+            self.fast_parses += 1
+        return result
+
+    def close(self) -> None:
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._started = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取解析器统计信息"""
+        return {
+            "mode": self.mode,
+            "workers": self.workers if self.mode == self.PROCESS else 0,
+            "parses": self.parses,
+            "fast_parses": self.fast_parses,
+            "pending": self.pending
+        }
+
+
+# 全局解析器实例
+_global_parser: Optional[FeedParser] = None
+
+
+def get_parser() -> FeedParser:
+    """获取全局解析器实例"""
+    global _global_parser
+    if _global_parser is None:
+        _global_parser = FeedParser()
+    return _global_parser
+
+
+def init_parser(mode: str = FeedParser.THREAD, workers: int = 0, fast_path: bool = True) -> FeedParser:
+    """
+    初始化全局解析器
+
+    Args:
+        mode: 解析模式（thread或process）
+        workers: 进程池大小，0表示CPU核数
+        fast_path: 是否优先使用流式快速解析
+
+    Returns:
+        解析器实例
+    """
+    global _global_parser
+    if _global_parser is not None:
+        _global_parser.close()
+    _global_parser = FeedParser(mode, workers, fast_path)
+    return _global_parser
@@ -0,0 +1,124 @@
+"""
+平衡选取模块
+在文章存储旁维护每个RSS源的候选池，按源配额和新旧权重选取文章，避免单个源占满结果
+"""
+
+import heapq
+import random
+from typing import Any, Dict, List, Optional, Set
+
+from ..config.settings import FeedSource, SamplingConfig
+from .article import Article
+from .store import ArticleStore, FeedDelta
+
+
+def _published(article: Article) -> float:
+    return article.published_timestamp
+
+
+class BalancedSampler:
+    """平衡选取引擎"""
+
+    def __init__(self, store: ArticleStore, config: SamplingConfig):
+        """
+        初始化平衡选取引擎
+
+        Args:
+            store: 文章存储
+            config: 平衡选取配置
+
+        Raises:
+            ValueError: 配置取值无效
+        """
+        if not 0 < config.recency_decay <= 1:
+            raise ValueError(f"sampling.recency_decay必须在(0, 1]之间: {config.recency_decay}")
+        if config.pool_size < 1:
+            raise ValueError(f"sampling.pool_size必须大于0: {config.pool_size}")
+        if not 0 <= config.min_per_source <= config.max_per_source:
+            raise ValueError(
+                f"sampling.min_per_source必须在0到max_per_source之间: "
+                f"min_per_source={config.min_per_source}, max_per_source={config.max_per_source}"
+            )
+        self.store = store
+        self.config = config
+        # RSS源地址 -> 按发布时间降序排列的最新pool_size篇文章
+        self._pools: Dict[str, List[Article]] = {}
+        # 按新旧排名的权重，只与配置有关，预先计算
+        self._weights = [config.recency_decay ** rank for rank in range(config.pool_size)]
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def apply(self, delta: FeedDelta) -> None:
+        """
+        文章存储写入时的回调：重建该源的候选池（每个源最多max_articles篇，只在内容变化时执行）
+
+        Args:
+            delta: 写入的变化
+        """
+        articles = self.store.get_feed_articles(delta.feed_url)
+        if articles:
+            self._pools[delta.feed_url] = heapq.nlargest(self.config.pool_size, articles, key=_published)
+        else:
+            self._pools.pop(delta.feed_url, None)
+
+    def quota(self, feed: FeedSource) -> int:
+        """RSS源每次最多选取的文章数"""
+        return self.config.max_per_source if feed.quota is None else feed.quota
+
+    def sample(self, feeds: List[FeedSource], limit: Optional[int] = None, seed: Optional[int] = None,
+               exclude: Optional[Set[str]] = None) -> List[Article]:
+        """
+        从每个源的候选池中选取文章
+
+        每个源在[min_per_source, 配额]之间随机决定选取数量，候选文章按新旧排名加权（不放回）抽取，
+        结果按发布时间降序排列。耗时与源数量和结果数量成正比。
+
+        Args:
+            feeds: RSS源列表
+            limit: 文章数量限制
+            seed: 随机种子，指定时相同数据下的结果可复现
+            exclude: 跳过的RSS源地址（本次不可用的源）
+
+        Returns:
+            文章列表
+        """
+        rng: Any = random.Random(seed) if seed is not None else random
+        selected: List[Article] = []
+        for feed in feeds:
+            pool = self._pools.get(feed.url)
+            if not pool or (exclude and feed.url in exclude):
+                continue
+            quota = self.quota(feed)
+            if quota <= 0:
+                continue
+            count = min(rng.randint(min(self.config.min_per_source, quota), quota), len(pool))
+            if count > 0:
+                selected.extend(self._weighted_sample(pool, count, rng))
+
+        if limit:
+            return heapq.nlargest(limit, selected, key=_published)
+        selected.sort(key=_published, reverse=True)
+        return selected
+
+    def _weighted_sample(self, pool: List[Article], count: int, rng: Any) -> List[Article]:
+        """按权重不放回抽取count篇（每篇取随机数的1/权重次方，保留最大的count个）"""
+        if count >= len(pool):
+            return list(pool)
+        keys = [
+            (rng.random() ** (1.0 / weight) if weight > 0 else 0.0, index)
+            for index, weight in enumerate(self._weights[:len(pool)])
+        ]
+        return [pool[index] for _, index in heapq.nlargest(count, keys)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取统计信息
+
+        Returns:
+            候选池数量和文章总数
+        """
+        return {
+            "pools": len(self._pools),
+            "candidates": sum(len(pool) for pool in self._pools.values())
+        }
@@ -0,0 +1,233 @@
+"""
+后台刷新模块
+按每个RSS源的更新频率自适应调整轮询间隔，保持缓存常热
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.settings import FeedSource, RefreshConfig
+from .article import Article
+
+
+logger = logging.getLogger(__name__)
+
+# 观测到的更新间隔的指数平滑系数
+_EWMA_ALPHA = 0.3
+
+# 内容未变化时轮询间隔的增长倍数
+_BACKOFF_FACTOR = 1.5
+
+# 轮询间隔的随机抖动比例，避免所有源同步刷新
+_JITTER = 0.1
+
+# 启动时首轮刷新的错开间隔（秒）
+_STARTUP_SPACING = 0.2
+
+
+@dataclass
+class FeedPollState:
+    """单个RSS源的轮询状态"""
+    feed: FeedSource
+    interval: float  # 当前轮询间隔（秒）
+    next_run: float = 0.0  # 下次刷新时间（monotonic）
+    update_interval: Optional[float] = None  # 观测到的更新间隔（秒）
+    poll_hint: Optional[float] = None  # 源或HTTP声明的最短刷新间隔（秒）
+    last_change: Optional[float] = None
+    refreshes: int = 0
+    failures: int = 0
+
+
+class FeedRefreshScheduler:
+    """RSS源后台刷新调度器"""
+
+    def __init__(self, feed_manager: Any, config: RefreshConfig):
+        """
+        初始化调度器
+
+        Args:
+            feed_manager: RSS源管理器
+            config: 后台刷新配置
+        """
+        self.feed_manager = feed_manager
+        self.config = config
+        self._states: Dict[str, FeedPollState] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self._running: set = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def is_running(self) -> bool:
+        """调度器是否正在运行"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """启动调度器（重复调用无副作用，需要在事件循环中调用）"""
+        if self.is_running:
+            return
+
+        base_interval = self._clamp(self.feed_manager.config.cache_duration)
+        now = time.monotonic()
+
+        self._states.clear()
+        self._queue.clear()
+        self._wakeup = asyncio.Event()
+        for i, feed in enumerate(self._iter_feeds()):
+            state = FeedPollState(feed=feed, interval=base_interval)
+            self._states[feed.url] = state
+            # 首轮刷新错开进行，之后各源按自身间隔分散
+            self._schedule(state, now + i * _STARTUP_SPACING)
+
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrent)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"后台刷新已启动，共 {len(self._states)} 个RSS源")
+
+    async def stop(self) -> None:
+        """停止调度器"""
+        tasks = list(self._running)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._running.clear()
+        logger.info("后台刷新已停止")
+
+    def _iter_feeds(self) -> List[FeedSource]:
+        """获取去重后的所有RSS源"""
+        feeds = {}
+        for category_feeds in self.feed_manager.get_all_feeds().values():
+            for feed in category_feeds:
+                feeds.setdefault(feed.url, feed)
+        return list(feeds.values())
+
+    def _schedule(self, state: FeedPollState, when: float) -> None:
+        """将RSS源加入优先队列"""
+        state.next_run = when
+        self._seq += 1
+        heapq.heappush(self._queue, (when, self._seq, state.feed.url))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        """调度主循环：按到期时间依次取出RSS源并刷新"""
+        while True:
+            delay = self._queue[0][0] - time.monotonic() if self._queue else None
+            if delay is None or delay > 0:
+                # 等待队首到期，或有更早的RSS源被重新加入队列
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, url = heapq.heappop(self._queue)
+            await self._semaphore.acquire()
+            task = asyncio.create_task(self._refresh(self._states[url]))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _refresh(self, state: FeedPollState) -> None:
+        """刷新单个RSS源并重新计算轮询间隔"""
+        try:
+            result = await self.feed_manager.refresh_feed(state.feed)
+            state.refreshes += 1
+            state.failures = 0
+            self._update_interval(state, result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state.failures += 1
+            # 失败时指数退避
+            state.interval = self._clamp(state.interval * 2)
+            logger.warning(f"后台刷新失败: {state.feed.name} - {e}，{state.interval:.0f}秒后重试")
+        finally:
+            self._semaphore.release()
+
+        jitter = random.uniform(1 - _JITTER, 1 + _JITTER)
+        delay = state.interval * jitter
+
+        # 缓存时间只覆盖到下次刷新之后留出min_interval余量，工具调用只需读取内存；
+        # 刷新停止（如失去刷新进程身份）后数据不会在长间隔内一直被视为未过期
+        self.feed_manager.set_feed_ttl(state.feed.url, delay + self.config.min_interval)
+        self._schedule(state, time.monotonic() + delay)
+
+    def _update_interval(self, state: FeedPollState, result: Any) -> None:
+        """
+        根据刷新结果调整轮询间隔
+
+        内容变化时以观测到的更新间隔的一半轮询，未变化时逐步放宽，
+        并以源声明的<ttl>/sy:updatePeriod/Cache-Control作为下限
+        """
+        now = time.monotonic()
+
+        if result.changed:
+            if state.last_change is not None:
+                sample = now - state.last_change
+            else:
+                sample = self._estimate_publish_interval(result.articles)
+
+            if sample:
+                if state.update_interval is None:
+                    state.update_interval = sample
+                else:
+                    state.update_interval = _EWMA_ALPHA * sample + (1 - _EWMA_ALPHA) * state.update_interval
+
+            state.last_change = now
+            target = state.update_interval / 2 if state.update_interval else state.interval
+        else:
+            target = state.interval * _BACKOFF_FACTOR
+
+        state.poll_hint = result.poll_hint
+        if result.poll_hint:
+            target = max(target, result.poll_hint)
+
+        state.interval = self._clamp(target)
+
+    @staticmethod
+    def _estimate_publish_interval(articles: List[Article]) -> Optional[float]:
+        """根据文章发布时间估算源的更新间隔（相邻文章时间差的中位数）"""
+        timestamps = sorted(
+            (a.published_timestamp for a in articles),
+            reverse=True
+        )
+        gaps = [a - b for a, b in zip(timestamps, timestamps[1:]) if a > b]
+        return statistics.median(gaps) if gaps else None
+
+    def _clamp(self, interval: float) -> float:
+        """将间隔限制在配置范围内"""
+        return min(max(interval, self.config.min_interval), self.config.max_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取调度统计信息
+
+        Returns:
+            运行状态及各RSS源的轮询间隔
+        """
+        now = time.monotonic()
+        return {
+            "running": self.is_running,
+            "feeds": len(self._states),
+            "in_flight": len(self._running),
+            "intervals": {
+                state.feed.name: {
+                    "interval": round(state.interval, 1),
+                    "next_refresh_in": round(max(state.next_run - now, 0), 1),
+                    "refreshes": state.refreshes,
+                    "failures": state.failures
+                }
+                for state in self._states.values()
+            }
+        }
@@ -0,0 +1,282 @@
+"""
+全文搜索模块
+维护文章的倒排索引，支持中日韩文字二元切分、短语查询、字段加权和BM25排序
+"""
+
+import heapq
+import html
+import math
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .article import Article
+from .store import FeedDelta
+
+
+# 中日韩文字范围（假名、汉字、扩展A、兼容汉字、韩文音节）
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_CJK_RE = re.compile(f"[{_CJK}]")
+_TOKEN_RE = re.compile(f"[{_CJK}]+|(?:(?![{_CJK}])[^\\W_])+")
+_TAG_RE = re.compile(r"<[^>]+>")
+_PHRASE_RE = re.compile(r'"([^"]*)"')
+
+# BM25参数
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    分词：拉丁文字按单词小写切分，中日韩文字切分为相邻二元组（单字保留为一元）
+
+    Args:
+        text: 文本
+
+    Returns:
+        按出现顺序排列的词项列表，下标即词项位置
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        word = match.group()
+        if _CJK_RE.match(word):
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word.casefold())
+    return tokens
+
+
+def _clean(text: Any) -> str:
+    """去除HTML标签和实体"""
+    if not isinstance(text, str):
+        return ""
+    return html.unescape(_TAG_RE.sub(" ", text))
+
+
+class SearchIndex:
+    """文章倒排索引"""
+
+    # 字段及其权重，标题命中的相关度高于摘要
+    FIELDS = ("title", "summary")
+    FIELD_BOOSTS = (2.0, 1.0)
+
+    def __init__(self):
+        # 词项 -> 文章ID -> 各字段中的位置列表
+        self._postings: Dict[str, Dict[str, Tuple[List[int], ...]]] = {}
+        # 文章ID -> 包含的词项，用于删除
+        self._doc_terms: Dict[str, Set[str]] = {}
+        # 文章ID -> 各字段长度
+        self._doc_lengths: Dict[str, Tuple[int, ...]] = {}
+        self._total_lengths = [0] * len(self.FIELDS)
+        # 中日韩单字 -> 包含该字的二元词项，用于单字查询
+        self._char_terms: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, doc_id: str, article: Article) -> None:
+        """
+        索引文章（已存在时先删除旧索引）
+
+        Args:
+            doc_id: 文章ID
+            article: 文章
+        """
+        if doc_id in self._doc_lengths:
+            self.remove(doc_id)
+
+        lengths = []
+        terms: Set[str] = set()
+        for field_index, field in enumerate(self.FIELDS):
+            tokens = tokenize(_clean(getattr(article, field)))
+            lengths.append(len(tokens))
+            for position, token in enumerate(tokens):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    if len(token) == 2 and _CJK_RE.match(token):
+                        for char in token:
+                            self._char_terms.setdefault(char, set()).add(token)
+                positions = postings.get(doc_id)
+                if positions is None:
+                    positions = postings[doc_id] = tuple([] for _ in self.FIELDS)
+                positions[field_index].append(position)
+                terms.add(token)
+
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = tuple(lengths)
+        for field_index, length in enumerate(lengths):
+            self._total_lengths[field_index] += length
+
+    def remove(self, doc_id: str) -> None:
+        """
+        从索引中删除文章
+
+        Args:
+            doc_id: 文章ID
+        """
+        lengths = self._doc_lengths.pop(doc_id, None)
+        if lengths is None:
+            return
+
+        for field_index, length in enumerate(lengths):
+            self._total_lengths[field_index] -= length
+
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                if len(term) == 2 and _CJK_RE.match(term):
+                    for char in term:
+                        char_terms = self._char_terms.get(char)
+                        if char_terms is not None:
+                            char_terms.discard(term)
+                            if not char_terms:
+                                del self._char_terms[char]
+
+    def apply(self, delta: FeedDelta) -> None:
+        """
+        文章存储写入时的回调：索引新增和变化的文章，删除已移除的文章
+
+        Args:
+            delta: 写入的变化
+        """
+        for doc_id in delta.removed:
+            self.remove(doc_id)
+        for article in delta.added + delta.updated:
+            self.add(article.id, article)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        搜索文章
+
+        查询中的每个词项都必须命中；双引号括起的内容和连续的中日韩文字按短语匹配（词项位置相邻）。
+
+        Args:
+            query: 查询语句
+            limit: 结果数量限制
+
+        Returns:
+            按相关度降序排列的 (文章ID, 得分) 列表
+        """
+        clauses = self._parse_query(query)
+        if not clauses:
+            return []
+
+        # 每个子句展开为候选文章集合，从最小的集合开始求交集
+        matches = []
+        for clause in clauses:
+            docs = self._match_clause(clause)
+            if not docs:
+                return []
+            matches.append(docs)
+        matches.sort(key=len)
+
+        candidates = set(matches[0])
+        for docs in matches[1:]:
+            candidates &= docs.keys()
+            if not candidates:
+                return []
+
+        scores = dict.fromkeys(candidates, 0.0)
+        for clause in clauses:
+            for term in clause:
+                self._score_term(term, scores)
+
+        if limit:
+            return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def _parse_query(self, query: str) -> List[List[str]]:
+        """解析查询：返回子句列表，每个子句是需要位置相邻的词项序列"""
+        clauses = []
+        for phrase in _PHRASE_RE.findall(query):
+            tokens = tokenize(phrase)
+            if tokens:
+                clauses.append(tokens)
+
+        for match in _TOKEN_RE.finditer(_PHRASE_RE.sub(" ", query)):
+            tokens = tokenize(match.group())
+            if tokens:
+                clauses.append(tokens)
+        return clauses
+
+    def _expand(self, term: str) -> List[str]:
+        """将查询词项展开为索引中的词项（中日韩单字展开为包含它的二元组）"""
+        if len(term) == 1 and _CJK_RE.match(term):
+            return [term] + sorted(self._char_terms.get(term, ()))
+        return [term]
+
+    def _match_clause(self, clause: List[str]) -> Dict[str, Any]:
+        """返回命中子句的文章ID集合（以字典键表示）"""
+        if len(clause) == 1:
+            docs: Dict[str, Any] = {}
+            for term in self._expand(clause[0]):
+                docs.update(self._postings.get(term, {}))
+            return docs
+
+        postings = [self._postings.get(term) for term in clause]
+        if any(p is None for p in postings):
+            return {}
+
+        # 以文档数最少的词项为起点，检查其余词项是否在相邻位置出现
+        smallest = min(postings, key=len)
+        docs = {}
+        for doc_id in smallest:
+            if all(doc_id in p for p in postings) and self._is_phrase_match(doc_id, postings):
+                docs[doc_id] = True
+        return docs
+
+    def _is_phrase_match(self, doc_id: str, postings: List[Dict[str, Tuple[List[int], ...]]]) -> bool:
+        """检查词项在同一字段中是否按顺序相邻出现"""
+        for field_index in range(len(self.FIELDS)):
+            first = postings[0][doc_id][field_index]
+            if not first:
+                continue
+            rest = [set(p[doc_id][field_index]) for p in postings[1:]]
+            for start in first:
+                if all(start + offset + 1 in positions for offset, positions in enumerate(rest)):
+                    return True
+        return False
+
+    def _score_term(self, term: str, scores: Dict[str, float]) -> None:
+        """按BM25F累加词项对候选文章的得分"""
+        total_docs = len(self._doc_lengths)
+        avg_lengths = [max(total / total_docs, 1.0) for total in self._total_lengths]
+
+        for index_term in self._expand(term):
+            postings = self._postings.get(index_term)
+            if not postings:
+                continue
+
+            df = len(postings)
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for doc_id in scores:
+                positions = postings.get(doc_id)
+                if positions is None:
+                    continue
+                lengths = self._doc_lengths[doc_id]
+                weighted_tf = 0.0
+                for field_index, boost in enumerate(self.FIELD_BOOSTS):
+                    tf = len(positions[field_index])
+                    if tf:
+                        norm = 1 - _B + _B * lengths[field_index] / avg_lengths[field_index]
+                        weighted_tf += boost * tf / norm
+                scores[doc_id] += idf * weighted_tf * (_K1 + 1) / (weighted_tf + _K1)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取索引统计信息
+
+        Returns:
+            文章数和词项数
+        """
+        return {
+            "documents": len(self._doc_lengths),
+            "terms": len(self._postings)
+        }
@@ -0,0 +1,69 @@
+"""
+请求合并模块
+保证同一个键同时只有一个任务在执行，并发调用者共享同一结果
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """按键合并并发调用"""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0        # 总调用次数
+        self.executions = 0   # 实际执行次数
+        self.coalesced = 0    # 被合并（复用进行中结果）的调用次数
+        self.failures = 0     # 执行失败次数
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行任务，若同键任务正在进行则等待其结果
+
+        Args:
+            key: 合并键
+            func: 返回协程的无参函数
+
+        Returns:
+            任务结果；任务失败时所有等待者都会收到同一异常
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+
+        # shield: 单个调用者被取消不影响其他等待者
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        """任务结束后移除并记录失败"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 读取异常，避免所有调用者都已取消时出现"exception was never retrieved"
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+    def in_flight(self) -> int:
+        """当前进行中的任务数"""
+        return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取统计信息
+
+        Returns:
+            调用、执行、合并和失败计数
+        """
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "in_flight": self.in_flight()
+        }
@@ -0,0 +1,266 @@
+"""
+文章存储模块
+保存所有RSS源解析后的完整文章集合，各工具调用从这里按需切片
+"""
+
+import hashlib
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .article import Article
+
+
+# 不影响文章内容的跟踪参数
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "yclid",
+    "ref", "ref_src", "cmpid", "smid", "smtyp", "ito", "at_medium", "at_campaign",
+}
+
+
+def normalize_url(url: str) -> str:
+    """
+    规范化文章URL，用于URL索引查找
+
+    协议统一为https，主机名小写并去掉默认端口，删除片段、跟踪参数（utm_*等）和路径末尾的斜杠，
+    其余查询参数按名称排序。
+
+    Args:
+        url: 文章URL
+
+    Returns:
+        规范化后的URL
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    scheme = "https" if parts.scheme.lower() in ("http", "https") else parts.scheme.lower()
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def make_article_id(feed_url: str, guid: Optional[str], link: Optional[str],
+                    title: str = "", published: str = "") -> str:
+    """
+    生成文章的稳定ID
+
+    Args:
+        feed_url: RSS源地址
+        guid: 条目的guid/id
+        link: 条目链接
+        title: 条目标题（没有guid和链接时使用）
+        published: 发布时间字符串（没有guid和链接时使用）
+
+    Returns:
+        文章ID（同一RSS源内guid或链接相同的条目ID相同；都没有时按标题和发布时间区分）
+    """
+    if guid or link:
+        key = f"{feed_url}\n{guid or link}"
+    else:
+        key = f"{feed_url}\n\n{title}\n{published}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+class FeedDelta(NamedTuple):
+    """一次写入相对该RSS源上一版本的变化，索引据此增量更新"""
+    feed_url: str
+    added: List[Article]  # 新出现的文章
+    updated: List[Article]  # ID相同但内容变化的文章
+    removed: List[str]  # 不再出现在源中的文章ID
+    reordered: bool  # 保留下来的文章在源内的顺序是否变化
+
+    @property
+    def changed(self) -> bool:
+        """内容或顺序是否有变化"""
+        return bool(self.added or self.updated or self.removed or self.reordered)
+
+
+def _same_content(a: Article, b: Article) -> bool:
+    """两篇文章的内容是否相同"""
+    return (
+        a.title == b.title and a.link == b.link and a.summary == b.summary
+        and a.published == b.published and a.published_timestamp == b.published_timestamp
+        and a.feed is b.feed
+    )
+
+
+class ArticleStore:
+    """文章存储"""
+
+    def __init__(self, max_articles_per_feed: int = 20):
+        """
+        初始化文章存储
+
+        Args:
+            max_articles_per_feed: 每个RSS源保留的最大文章数
+        """
+        self.max_articles_per_feed = max_articles_per_feed
+        self._articles: Dict[str, Article] = {}
+        self._feeds: Dict[str, List[str]] = {}  # RSS源地址 -> 按源内顺序排列的文章ID
+        self.generation = 0  # 每次内容变化时递增
+        self._listeners: List[Callable[[FeedDelta], None]] = []
+
+    def add_listener(self, listener: Callable[[FeedDelta], None]) -> None:
+        """
+        注册写入回调，用于增量维护索引（只在内容或顺序变化时调用）
+
+        Args:
+            listener: 回调函数，参数为本次写入的变化
+        """
+        self._listeners.append(listener)
+
+    def ingest(self, feed_url: str, articles: List[Article]) -> FeedDelta:
+        """
+        写入RSS源的最新文章列表，替换该源之前的内容
+
+        与上一版本按文章ID比较：内容未变化的文章保留原对象，只有新增、变化和移除的文章通知索引；
+        没有任何变化时版本号不变。
+
+        Args:
+            feed_url: RSS源地址
+            articles: 文章列表，按源内顺序排列
+
+        Returns:
+            本次写入的变化
+        """
+        previous_ids = self._feeds.get(feed_url, [])
+        previous_set = set(previous_ids)
+        ids = []
+        seen = set()
+        added = []
+        updated = []
+        for article in articles:
+            article_id = article.id
+            if article_id in seen:
+                continue
+            seen.add(article_id)
+            ids.append(article_id)
+
+            previous = self._articles.get(article_id) if article_id in previous_set else None
+            if previous is None:
+                added.append(article)
+            elif previous is not article and not _same_content(previous, article):
+                updated.append(article)
+            else:
+                article = previous
+            self._articles[article_id] = article
+            if len(ids) >= self.max_articles_per_feed:
+                break
+
+        # 移除已不在源中的文章
+        removed = [article_id for article_id in previous_ids if article_id not in seen]
+        for article_id in removed:
+            self._articles.pop(article_id, None)
+
+        reordered = [i for i in previous_ids if i in seen] != [i for i in ids if i in previous_set]
+        delta = FeedDelta(feed_url, added, updated, removed, reordered)
+
+        self._feeds[feed_url] = ids
+        if delta.changed:
+            self.generation += 1
+            for listener in self._listeners:
+                listener(delta)
+        return delta
+
+    def has_feed(self, feed_url: str) -> bool:
+        """RSS源是否已写入存储"""
+        return feed_url in self._feeds
+
+    def get(self, article_id: str) -> Optional[Article]:
+        """根据ID获取文章"""
+        return self._articles.get(article_id)
+
+    def get_feed_articles(self, feed_url: str, limit: Optional[int] = None) -> List[Article]:
+        """
+        获取RSS源的文章
+
+        Args:
+            feed_url: RSS源地址
+            limit: 文章数量限制
+
+        Returns:
+            按源内顺序排列的文章列表
+        """
+        ids = self._feeds.get(feed_url, [])
+        if limit:
+            ids = ids[:limit]
+        return [self._articles[article_id] for article_id in ids]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取存储统计信息
+
+        Returns:
+            文章数、RSS源数和当前版本号
+        """
+        return {
+            "articles": len(self._articles),
+            "feeds": len(self._feeds),
+            "generation": self.generation
+        }
+
+
+class UrlIndex:
+    """规范化URL到文章ID的索引"""
+
+    def __init__(self):
+        self._ids: Dict[str, List[str]] = {}  # 规范化URL -> 文章ID（多个源可能收录同一链接）
+        self._urls: Dict[str, str] = {}  # 文章ID -> 规范化URL
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def apply(self, delta: FeedDelta) -> None:
+        """
+        文章存储写入时的回调：索引新增和变化的文章，删除已移除的文章
+
+        Args:
+            delta: 写入的变化
+        """
+        for article_id in delta.removed:
+            self._remove(article_id)
+        for article in delta.added + delta.updated:
+            link = article.link
+            if not link:
+                continue
+            article_id = article.id
+            key = normalize_url(link)
+            if self._urls.get(article_id) == key:
+                continue
+            self._remove(article_id)
+            self._urls[article_id] = key
+            self._ids.setdefault(key, []).append(article_id)
+
+    def _remove(self, article_id: str) -> None:
+        """删除文章的URL映射"""
+        key = self._urls.pop(article_id, None)
+        if key is None:
+            return
+        ids = self._ids.get(key)
+        if ids is not None:
+            if article_id in ids:
+                ids.remove(article_id)
+            if not ids:
+                del self._ids[key]
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        查找URL对应的文章ID
+
+        Args:
+            url: 文章URL（无需规范化）
+
+        Returns:
+            文章ID，未找到时返回None
+        """
+        ids = self._ids.get(normalize_url(url))
+        return ids[0] if ids else None
@@ -0,0 +1,140 @@
+"""
+时间线模块
+按发布时间维护全部RSS源和各分类的有序文章序列，写入时增量更新，读取最新文章只需切片
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..config.settings import FeedSource
+from .article import Article
+from .store import FeedDelta
+
+
+# 排序键：(-发布时间戳, 文章ID)，升序即发布时间降序，时间相同时按ID保证顺序稳定
+TimelineKey = Tuple[float, str]
+
+
+class Timeline:
+    """按发布时间降序排列的文章序列"""
+
+    def __init__(self):
+        self._keys: List[TimelineKey] = []
+        self._feeds: List[str] = []  # 与_keys对应的RSS源地址，读取时按源过滤
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def insert(self, key: TimelineKey, feed_url: str) -> None:
+        """按排序键插入文章"""
+        index = bisect.bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._feeds.insert(index, feed_url)
+
+    def remove(self, key: TimelineKey) -> None:
+        """删除文章（不存在时忽略）"""
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+            del self._feeds[index]
+
+    def latest(self, limit: Optional[int] = None, feeds: Optional[Set[str]] = None) -> List[str]:
+        """
+        读取最新的文章ID
+
+        Args:
+            limit: 数量限制
+            feeds: 只包含这些RSS源的文章，None表示不过滤
+
+        Returns:
+            按发布时间降序排列的文章ID
+        """
+        if feeds is None:
+            keys = self._keys[:limit] if limit else self._keys
+            return [article_id for _, article_id in keys]
+
+        ids = []
+        for (_, article_id), feed_url in zip(self._keys, self._feeds):
+            if feed_url in feeds:
+                ids.append(article_id)
+                if limit and len(ids) >= limit:
+                    break
+        return ids
+
+
+class TimelineIndex:
+    """全部RSS源及各分类的时间线"""
+
+    def __init__(self, categories: Dict[str, List[FeedSource]]):
+        """
+        初始化时间线索引
+
+        Args:
+            categories: 分类 -> RSS源列表
+        """
+        self._all = Timeline()
+        self._categories: Dict[str, Timeline] = {name: Timeline() for name in categories}
+        # RSS源地址 -> 所属分类的时间线（同一源可能属于多个分类）
+        self._feed_timelines: Dict[str, List[Timeline]] = {}
+        for name, feeds in categories.items():
+            for feed in feeds:
+                timelines = self._feed_timelines.setdefault(feed.url, [])
+                if self._categories[name] not in timelines:
+                    timelines.append(self._categories[name])
+        # 文章ID -> 当前排序键，用于删除和更新
+        self._keys: Dict[str, TimelineKey] = {}
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def apply(self, delta: FeedDelta) -> None:
+        """
+        文章存储写入时的回调：插入新增的文章，移动发布时间变化的文章，删除已移除的文章
+
+        Args:
+            delta: 写入的变化
+        """
+        timelines = [self._all] + self._feed_timelines.get(delta.feed_url, [])
+        for article_id in delta.removed:
+            self._remove(article_id, timelines)
+        for article in delta.updated:
+            if self._keys.get(article.id) != self._key(article):
+                self._remove(article.id, timelines)
+                self._insert(article, delta.feed_url, timelines)
+        for article in delta.added:
+            self._insert(article, delta.feed_url, timelines)
+
+    @staticmethod
+    def _key(article: Article) -> TimelineKey:
+        return (-article.published_timestamp, article.id)
+
+    def _insert(self, article: Article, feed_url: str, timelines: Iterable[Timeline]) -> None:
+        key = self._key(article)
+        self._keys[article.id] = key
+        for timeline in timelines:
+            timeline.insert(key, feed_url)
+
+    def _remove(self, article_id: str, timelines: Iterable[Timeline]) -> None:
+        key = self._keys.pop(article_id, None)
+        if key is None:
+            return
+        for timeline in timelines:
+            timeline.remove(key)
+
+    def latest(self, category: Optional[str] = None, limit: Optional[int] = None,
+               feeds: Optional[Set[str]] = None) -> List[str]:
+        """
+        读取最新的文章ID
+
+        Args:
+            category: 分类名称，None表示全部RSS源
+            limit: 数量限制
+            feeds: 只包含这些RSS源的文章，None表示不过滤
+
+        Returns:
+            按发布时间降序排列的文章ID，分类不存在时为空列表
+        """
+        timeline = self._all if category is None else self._categories.get(category)
+        if timeline is None:
+            return []
+        return timeline.latest(limit, feeds)
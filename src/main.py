@@ -4,6 +4,7 @@ News MCP Server 主入口点
 
 import argparse
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -12,7 +13,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.config.settings import load_config
-from src.server import create_server, setup_logging
+from src.server import create_server, run_multi_protocol_server, run_worker_processes, setup_logging
 
 logger = logging.getLogger(__name__)
 
@@ -27,17 +28,20 @@ def parse_args():
   stdio           - 标准输入输出协议 (默认，适用于本地工具)
   sse             - Server-Sent Events协议 (适用于Web集成)
   streamable-http - 流式HTTP协议 (推荐用于Web部署)
+  multi           - 同一端口同时提供SSE和流式HTTP (共享缓存和后台刷新)
 
 示例:
   python -m src.main                                    # 使用stdio协议
   python -m src.main --transport sse                    # 使用SSE协议，默认端口8000
   python -m src.main --transport streamable-http --port 3000  # 使用HTTP协议，端口3000
+  python -m src.main --transport multi                  # 同时提供 /sse 和 /mcp
+  python -m src.main --transport streamable-http --workers 8  # 8个工作进程共享端口和缓存
         """
     )
     
     parser.add_argument(
         '--transport', '-t',
-        choices=['stdio', 'sse', 'streamable-http'],
+        choices=['stdio', 'sse', 'streamable-http', 'multi'],
         default=None,
         help='传输协议 (默认: 从配置文件读取)'
     )
@@ -55,6 +59,13 @@ def parse_args():
         help='HTTP服务器端口 (默认: 从配置文件读取)'
     )
     
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=None,
+        help='工作进程数，仅streamable-http传输 (默认: 从配置文件读取)'
+    )
+    
     parser.add_argument(
         '--log-level',
         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
@@ -75,6 +86,18 @@ def run_server(transport: str, host: str, port: int, config):
     """运行服务器"""
     logger.info(f"启动 News MCP Server，传输协议: {transport}")
 
+    if config.workers.count > 1 and not hasattr(os, 'fork'):
+        logger.warning("当前平台不支持多进程模式，使用单进程运行")
+        config.workers.count = 1
+
+    # 多进程模式：服务器在各工作进程派生后分别创建
+    if config.workers.count > 1:
+        if transport != 'streamable-http':
+            raise ValueError(f"多进程模式只支持 streamable-http 传输协议，当前为: {transport}")
+        logger.info(f"Streamable HTTP 服务器将在 http://{host}:{port}/mcp 启动")
+        run_worker_processes(config, host, port)
+        return
+
     # 创建服务器
     mcp = create_server(config)
 
@@ -118,6 +141,9 @@ def main():
         host = args.host or config.transport.http_host
         port = args.port or config.transport.http_port
         
+        if args.workers is not None:
+            config.workers.count = args.workers
+        
         # 设置日志级别
         if args.log_level:
             config.logging.level = args.log_level
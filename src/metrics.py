@@ -0,0 +1,233 @@
+"""
+指标模块
+以Prometheus文本格式导出工具调用、RSS源抓取解析、缓存和执行器的运行指标
+"""
+
+import functools
+import math
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# 延迟直方图的默认分桶（秒）
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """单调递增计数器"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """按标签值增加计数"""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Histogram:
+    """累积分桶直方图"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # 标签值 -> [各分桶计数（非累积）..., 总和, 次数]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """记录一次观测值"""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0.0] * (len(self.buckets) + 3)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        else:
+            series[len(self.buckets)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def collect(self) -> List[str]:
+        lines = []
+        names = self.labelnames + ("le",)
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} "
+                    f"{_format_value(cumulative)}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{label_text} {_format_value(series[-1])}")
+        return lines
+
+
+class CallbackMetric:
+    """导出时才读取数值的指标，用于已有统计字段（缓存命中数、并发数等）"""
+
+    def __init__(self, name: str, documentation: str, type: str,
+                 func: Callable[[], Any], labelnames: Tuple[str, ...] = ()):
+        """
+        Args:
+            name: 指标名
+            documentation: 说明
+            type: counter或gauge
+            func: 返回数值，或 {标签值元组: 数值} 字典
+            labelnames: 标签名
+        """
+        self.name = name
+        self.documentation = documentation
+        self.type = type
+        self.func = func
+        self.labelnames = labelnames
+
+    def collect(self) -> List[str]:
+        value = self.func()
+        if value is None:
+            return []
+        if not isinstance(value, dict):
+            return [f"{self.name} {_format_value(value)}"]
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(sample)}"
+            for labels, sample in sorted(value.items())
+        ]
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self, prefix: str = "news_mcp"):
+        self.prefix = prefix
+        self._metrics: Dict[str, Any] = {}
+
+        self.tool_calls = self.counter(
+            "tool_calls_total", "工具调用次数（status: ok/error）", ("tool", "status"))
+        self.tool_duration = self.histogram(
+            "tool_duration_seconds", "工具调用耗时", ("tool",))
+        self.feed_fetch_duration = self.histogram(
+            "feed_fetch_duration_seconds", "RSS源下载耗时（含排队）", ("feed",))
+        self.feed_parse_duration = self.histogram(
+            "feed_parse_duration_seconds", "RSS源解析耗时（含执行器排队）", ("feed",))
+        self.feed_bytes = self.counter(
+            "feed_response_bytes_total", "RSS源下载的响应体字节数", ("feed",))
+        self.feed_responses = self.counter(
+            "feed_http_responses_total", "RSS源HTTP响应数（status为状态码，网络错误为error）",
+            ("feed", "status"))
+
+    def _register(self, metric: Any) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"指标已注册: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """注册计数器"""
+        return self._register(Counter(f"{self.prefix}_{name}", documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """注册直方图"""
+        return self._register(Histogram(f"{self.prefix}_{name}", documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, type: str, func: Callable[[], Any],
+                 labelnames: Tuple[str, ...] = ()) -> CallbackMetric:
+        """
+        注册导出时读取的指标，同名指标会被替换（重新创建服务器时回调指向新的组件）
+        """
+        metric = CallbackMetric(f"{self.prefix}_{name}", documentation, type, func, labelnames)
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        生成Prometheus文本格式
+
+        Returns:
+            指标文本
+        """
+        lines = []
+        for metric in self._metrics.values():
+            try:
+                samples = metric.collect()
+            except Exception as e:
+                lines.append(f"# {metric.name} 读取失败: {_escape(str(e))}")
+                continue
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def observe_tool(self, func: Callable) -> Callable:
+        """
+        工具函数装饰器，记录调用次数和耗时
+
+        保留原函数的签名和文档（FastMCP据此生成参数模式），应放在@mcp.tool()之下。
+        """
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            status = "error"
+            try:
+                result = await func(*args, **kwargs)
+                # 工具出错时返回带error字段（或status为error）的字典，而不是抛出异常
+                failed = isinstance(result, dict) and ("error" in result or result.get("status") == "error")
+                status = "error" if failed else "ok"
+                return result
+            finally:
+                self.tool_calls.inc(name, status)
+                self.tool_duration.observe(time.perf_counter() - start, name)
+
+        return wrapper
+
+
+# 全局指标注册表
+_global_metrics: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """获取全局指标注册表"""
+    global _global_metrics
+    if _global_metrics is None:
+        _global_metrics = MetricsRegistry()
+    return _global_metrics
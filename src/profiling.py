@@ -0,0 +1,285 @@
+"""
+性能分析模块
+按需采集CPU剖析（采样调用栈或cProfile）、内存快照差异和asyncio任务栈，空闲时没有任何开销
+"""
+
+import asyncio
+import cProfile
+import io
+import logging
+import marshal
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerBusyError(Exception):
+    """已有CPU剖析正在进行"""
+    pass
+
+
+class SamplingProfiler:
+    """
+    墙钟采样剖析器
+
+    后台线程按固定间隔读取所有线程的调用栈（sys._current_frames），
+    输出折叠栈格式（每行"线程;外层函数;...;内层函数 次数"），可直接用于火焰图工具。
+    只在剖析期间存在采样线程。
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        初始化采样剖析器
+
+        Args:
+            interval: 采样间隔（秒）
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """折叠栈文本"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class MemoryTracer:
+    """tracemalloc快照，每次快照与上一次比较"""
+
+    def __init__(self):
+        self._last: Optional[tracemalloc.Snapshot] = None
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def snapshot(self, frames: int = 1, top: int = 30) -> str:
+        """
+        拍摄内存快照并输出与上一次快照的差异
+
+        首次调用只开始跟踪（跟踪期间内存分配变慢），之后每次调用输出增长最多的位置
+
+        Args:
+            frames: 每次分配记录的调用栈深度（仅在开始跟踪时生效）
+            top: 输出的条目数
+
+        Returns:
+            差异报告文本
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._last = self._take()
+            return f"tracemalloc已开始跟踪（调用栈深度 {frames}），再次请求快照查看差异\n"
+
+        current = self._take()
+        key_type = "traceback" if tracemalloc.get_traceback_limit() > 1 else "lineno"
+        stats = current.compare_to(self._last, key_type) if self._last is not None else \
+            current.statistics(key_type)
+        self._last = current
+
+        traced, peak = tracemalloc.get_traced_memory()
+        lines = [f"当前跟踪内存 {traced / 1024:.1f} KiB，峰值 {peak / 1024:.1f} KiB，与上次快照的差异:"]
+        for stat in stats[:top]:
+            lines.append(str(stat))
+            if key_type == "traceback":
+                lines.extend(f"    {line}" for line in stat.traceback.format())
+        return "\n".join(lines) + "\n"
+
+    def stop(self) -> str:
+        """停止跟踪并丢弃快照"""
+        self._last = None
+        if not tracemalloc.is_tracing():
+            return "tracemalloc未在跟踪\n"
+        tracemalloc.stop()
+        return "tracemalloc已停止\n"
+
+
+def format_tasks() -> str:
+    """
+    输出当前事件循环中所有asyncio任务的调用栈
+
+    Returns:
+        任务栈文本
+    """
+    tasks = sorted(asyncio.all_tasks(), key=lambda task: task.get_name())
+    buffer = io.StringIO()
+    buffer.write(f"共 {len(tasks)} 个任务\n")
+    for task in tasks:
+        buffer.write(f"\n{task!r}\n")
+        task.print_stack(file=buffer)
+    return buffer.getvalue()
+
+
+class Profiler:
+    """按需性能分析入口，供管理路由和信号处理使用"""
+
+    COLLAPSED = "collapsed"
+    PSTATS = "pstats"
+
+    def __init__(self, dump_dir: str = "data/profiles", max_seconds: float = 120):
+        """
+        初始化性能分析器
+
+        Args:
+            dump_dir: 信号触发时输出文件的目录
+            max_seconds: 单次CPU剖析的最长时间（秒）
+        """
+        self.dump_dir = Path(dump_dir)
+        self.max_seconds = max_seconds
+        self.memory = MemoryTracer()
+        self._busy = False
+        self._signals_installed = False
+
+    async def cpu_profile(self, seconds: float, format: str = COLLAPSED, interval: float = 0.005) -> bytes:
+        """
+        剖析指定时长的CPU使用
+
+        collapsed格式对所有线程（含解析线程池）做墙钟采样；
+        pstats格式对事件循环线程运行cProfile，结果可用pstats或snakeviz读取。
+
+        Args:
+            seconds: 剖析时长（秒），不超过max_seconds
+            format: collapsed或pstats
+            interval: 采样间隔（秒），仅collapsed格式使用
+
+        Returns:
+            剖析结果
+
+        Raises:
+            ProfilerBusyError: 已有剖析正在进行
+            ValueError: 不支持的格式
+        """
+        if format not in (self.COLLAPSED, self.PSTATS):
+            raise ValueError(f"不支持的剖析格式: {format}")
+        if self._busy:
+            raise ProfilerBusyError("已有CPU剖析正在进行")
+
+        seconds = max(0.0, min(seconds, self.max_seconds))
+        self._busy = True
+        try:
+            if format == self.PSTATS:
+                profile = cProfile.Profile()
+                profile.enable()
+                try:
+                    await asyncio.sleep(seconds)
+                finally:
+                    profile.disable()
+                profile.create_stats()
+                # 与pstats.Stats.dump_stats写入的文件格式相同
+                return marshal.dumps(profile.stats)
+
+            sampler = SamplingProfiler(interval)
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                sampler.stop()
+            return sampler.collapsed().encode("utf-8")
+        finally:
+            self._busy = False
+
+    def install_signal_handlers(self, seconds: float) -> None:
+        """
+        安装信号处理（stdio模式下没有HTTP路由时使用，可重复调用）
+
+        SIGUSR1：CPU采样剖析seconds秒，写入dump_dir；
+        SIGUSR2：写入asyncio任务栈和内存快照差异（首次只开始跟踪）。
+
+        Args:
+            seconds: SIGUSR1触发的剖析时长（秒）
+        """
+        if self._signals_installed or not hasattr(signal, "SIGUSR1"):
+            return
+        # 信号只能在主线程的事件循环中处理（嵌入其他程序或测试客户端时跳过）
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGUSR1, lambda: asyncio.ensure_future(self._dump_profile(seconds)))
+        loop.add_signal_handler(signal.SIGUSR2, self._dump_state)
+        self._signals_installed = True
+        logger.info(f"性能分析信号已安装（pid {os.getpid()}）：SIGUSR1剖析CPU，SIGUSR2输出任务栈和内存差异")
+
+    def _dump_path(self, name: str) -> Path:
+        self.dump_dir.mkdir(parents=True, exist_ok=True)
+        return self.dump_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{name}"
+
+    async def _dump_profile(self, seconds: float) -> None:
+        try:
+            result = await self.cpu_profile(seconds)
+        except ProfilerBusyError:
+            logger.warning("已有CPU剖析正在进行，忽略信号")
+            return
+        path = self._dump_path("cpu.collapsed")
+        path.write_bytes(result)
+        logger.info(f"CPU剖析已写入: {path}")
+
+    def _dump_state(self) -> None:
+        path = self._dump_path("state.txt")
+        path.write_text(format_tasks() + "\n" + self.memory.snapshot(), encoding="utf-8")
+        logger.info(f"任务栈和内存快照已写入: {path}")
+
+
+# 全局性能分析器实例
+_global_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Profiler:
+    """获取全局性能分析器实例"""
+    global _global_profiler
+    if _global_profiler is None:
+        _global_profiler = Profiler()
+    return _global_profiler
+
+
+def init_profiler(dump_dir: str = "data/profiles", max_seconds: float = 120) -> Profiler:
+    """
+    初始化全局性能分析器
+
+    Args:
+        dump_dir: 信号触发时输出文件的目录
+        max_seconds: 单次CPU剖析的最长时间（秒）
+
+    Returns:
+        性能分析器实例
+    """
+    global _global_profiler
+    _global_profiler = Profiler(dump_dir, max_seconds)
+    return _global_profiler
@@ -3,13 +3,24 @@ MCP服务器模块
 负责创建和配置MCP服务器
 """
 
+import dataclasses
+import hmac
 import logging
+import os
+from contextlib import asynccontextmanager
 from mcp.server.fastmcp import FastMCP
 
 from .config.settings import AppConfig
 from .feeds.manager import FeedManager
 from .feeds.cache import init_cache
+from .feeds.fetcher import init_fetcher
+from .feeds.health import init_health_tracker
+from .feeds.parser import init_parser
+from .feeds.scheduler import FeedRefreshScheduler
+from .metrics import CONTENT_TYPE, get_metrics
+from .profiling import Profiler, ProfilerBusyError, format_tasks, init_profiler
 from .tools.manager import ToolManager
+from .workers import RefresherElection, run_workers
 
 logger = logging.getLogger(__name__)
 
@@ -24,29 +35,185 @@ def create_server(config: AppConfig) -> FastMCP:
     Returns:
         配置好的FastMCP服务器实例
     """
-    # 创建MCP服务器
-    mcp = FastMCP(config.server.name)
-    
     # 初始化缓存
     init_cache(
         default_ttl=config.cache.duration,
-        max_size=config.cache.max_size
+        max_size=config.cache.max_size,
+        stale_while_revalidate=config.cache.stale_while_revalidate,
+        stale_if_error=config.cache.stale_if_error,
+        max_bytes=config.cache.max_bytes,
+        persistent_path=config.cache.persistent_path,
+        shared=config.workers.count > 1
+    )
+
+    # 初始化HTTP抓取器（共享连接池）
+    init_fetcher(
+        timeout=config.limits.request_timeout,
+        max_concurrent=config.limits.max_concurrent_fetches,
+        max_per_host=config.limits.max_fetches_per_host
+    )
+
+    # 初始化RSS源健康状态（失败退避与熔断）
+    init_health_tracker(
+        failure_threshold=config.health.failure_threshold,
+        base_backoff=config.health.base_backoff,
+        max_backoff=config.health.max_backoff
+    )
+
+    # 初始化RSS解析器（线程池或进程池）
+    parser = init_parser(
+        mode=config.parsing.mode,
+        workers=config.parsing.workers,
+        fast_path=config.parsing.fast_path
+    )
+    
+    # 初始化按需性能分析（只在收到请求或信号时工作）
+    profiler = init_profiler(
+        dump_dir=config.profiling.dump_dir,
+        max_seconds=config.profiling.max_seconds
     )
     
     # 创建RSS源管理器
     feed_manager = FeedManager(config.feeds)
 
+    # 创建后台刷新调度器，保持所有RSS源的缓存常热
+    scheduler = None
+    if config.refresh.enabled:
+        scheduler = FeedRefreshScheduler(feed_manager, config.refresh)
+
+    # 多进程模式下只有当选的进程运行后台刷新，其他进程从共享的磁盘缓存读取
+    election = None
+    if scheduler is not None and config.workers.count > 1:
+        election = RefresherElection(config.workers.lock_path, config.workers.election_interval)
+        if config.cache.persistent_path:
+            # 其他进程持有锁时不请求上游，等待刷新进程写入共享磁盘缓存
+            feed_manager.set_follower_check(lambda: election.has_leader and not election.is_leader)
+
+    # 解析进程池和调度器在首个会话建立时启动（lifespan按会话进入，start是幂等的）
+    @asynccontextmanager
+    async def lifespan(server: FastMCP):
+        await parser.start()
+        if election is not None:
+            election.start(scheduler.start)
+        elif scheduler is not None:
+            scheduler.start()
+        if config.profiling.signals:
+            profiler.install_signal_handlers(config.profiling.signal_seconds)
+        yield
+
+    # 创建MCP服务器
+    mcp = FastMCP(config.server.name, lifespan=lifespan)
+
     # 创建工具管理器并注册工具
-    tool_manager = ToolManager(config, feed_manager)
+    tool_manager = ToolManager(config, feed_manager, scheduler)
     tool_manager.register_tools(mcp)
     
     # 配置HTTP路由（如果需要）
     _setup_http_routes(mcp, config)
+    if config.metrics.enabled:
+        _setup_metrics_route(mcp, config, feed_manager, tool_manager)
+    _setup_profiling_routes(mcp, config, profiler)
     
     logger.info(f"MCP服务器 '{config.server.name}' 创建完成")
     return mcp
 
 
+def create_multi_protocol_app(mcp: FastMCP):
+    """
+    创建同时提供SSE和Streamable HTTP端点的ASGI应用
+
+    两种协议共用同一个MCP服务器实例，因此共享RSS源管理器、缓存和后台刷新调度器。
+
+    Args:
+        mcp: 配置好的FastMCP服务器实例
+
+    Returns:
+        Starlette应用，包含 /mcp、/sse、/messages 和自定义路由
+    """
+    from starlette.applications import Starlette
+
+    http_app = mcp.streamable_http_app()
+    sse_app = mcp.sse_app()
+
+    # 自定义路由在两个应用中都存在，只保留一份
+    routes = list(http_app.routes)
+    paths = {getattr(route, "path", None) for route in routes}
+    routes.extend(route for route in sse_app.routes if getattr(route, "path", None) not in paths)
+
+    return Starlette(
+        debug=mcp.settings.debug,
+        routes=routes,
+        middleware=http_app.user_middleware,
+        # Streamable HTTP的会话管理器需要在应用生命周期内运行，SSE连接没有全局状态
+        lifespan=lambda app: mcp.session_manager.run()
+    )
+
+
+def run_multi_protocol_server(mcp: FastMCP, host: str, port: int) -> None:
+    """
+    在同一进程和端口上运行SSE和Streamable HTTP服务器
+
+    Args:
+        mcp: 配置好的FastMCP服务器实例
+        host: 监听地址
+        port: 监听端口
+    """
+    import uvicorn
+
+    mcp.settings.host = host
+    mcp.settings.port = port
+    uvicorn.run(
+        create_multi_protocol_app(mcp),
+        host=host,
+        port=port,
+        log_level=mcp.settings.log_level.lower()
+    )
+
+
+def run_worker_processes(config: AppConfig, host: str, port: int) -> None:
+    """
+    以多个预派生的工作进程运行Streamable HTTP服务器
+
+    每个工作进程在派生后独立创建服务器，使用无状态会话（同一客户端的请求可能落到不同进程），
+    RSS源数据通过共享的磁盘缓存在进程间复用。
+
+    Args:
+        config: 应用程序配置
+        host: 监听地址
+        port: 监听端口
+    """
+    import importlib.util
+    import uvicorn
+
+    if not config.cache.persistent_path:
+        logger.warning("未配置磁盘缓存(cache.persistent_path)，各工作进程将分别抓取RSS源")
+    loop = "uvloop" if config.workers.uvloop and importlib.util.find_spec("uvloop") else "asyncio"
+    logger.info(f"启动 {config.workers.count} 个工作进程，事件循环: {loop}")
+
+    # 解析进程池按工作进程数平分（每个工作进程各自创建进程池）
+    total_parse_workers = config.parsing.workers or os.cpu_count() or 1
+    parsing = dataclasses.replace(
+        config.parsing, workers=max(1, total_parse_workers // config.workers.count)
+    )
+    config = dataclasses.replace(config, parsing=parsing)
+    if config.parsing.mode == "process":
+        logger.info(f"每个工作进程的解析进程数: {parsing.workers}")
+
+    def serve(sock):
+        mcp = create_server(config)
+        mcp.settings.host = host
+        mcp.settings.port = port
+        mcp.settings.stateless_http = True
+        server = uvicorn.Server(uvicorn.Config(
+            mcp.streamable_http_app(),
+            loop=loop,
+            log_level=mcp.settings.log_level.lower()
+        ))
+        server.run(sockets=[sock])
+
+    run_workers(config.workers.count, host, port, serve)
+
+
 def _setup_http_routes(mcp: FastMCP, config: AppConfig):
     """设置HTTP路由"""
     
@@ -127,6 +294,115 @@ def _setup_http_routes(mcp: FastMCP, config: AppConfig):
         return Response(status_code=204)
 
 
+def _setup_metrics_route(mcp: FastMCP, config: AppConfig, feed_manager: FeedManager,
+                         tool_manager: ToolManager):
+    """注册组件统计的导出回调，并设置指标路由"""
+    metrics = get_metrics()
+
+    cache_counters = {
+        "hits": "缓存命中次数",
+        "stale_hits": "返回过期数据并后台刷新的次数",
+        "misses": "缓存未命中次数",
+        "disk_hits": "从磁盘缓存层恢复的次数",
+        "shared_reloads": "从其他工作进程写入的磁盘缓存重新加载的次数",
+        "evictions": "按LRU淘汰的条目数",
+        "expirations": "完全失效后清理的条目数",
+    }
+    for field, documentation in cache_counters.items():
+        metrics.callback(f"cache_{field}_total", documentation, "counter",
+                         lambda field=field: feed_manager.cache.get_stats()[field])
+    metrics.callback("cache_entries", "缓存条目数", "gauge", lambda: feed_manager.cache.get_stats()["size"])
+    metrics.callback("cache_bytes", "缓存占用字节数（近似值）", "gauge",
+                     lambda: feed_manager.cache.get_stats()["bytes"])
+
+    metrics.callback("response_cache_hits_total", "工具响应缓存命中次数", "counter",
+                     lambda: tool_manager.responses.hits)
+    metrics.callback("response_cache_misses_total", "工具响应缓存未命中次数", "counter",
+                     lambda: tool_manager.responses.misses)
+    metrics.callback("response_cache_bypasses_total", "因RSS源需要刷新而未使用工具响应缓存的次数（计入未命中）",
+                     "counter", lambda: tool_manager.responses.bypasses)
+
+    metrics.callback("fetches_in_flight", "正在进行的RSS源下载数", "gauge",
+                     lambda: feed_manager.fetcher.in_flight)
+    metrics.callback("fetches_waiting", "等待并发配额的RSS源下载数", "gauge",
+                     lambda: feed_manager.fetcher.waiting)
+    metrics.callback("parser_pending", "已提交到解析执行器但未完成的任务数（含排队）", "gauge",
+                     lambda: feed_manager.parser.pending)
+    metrics.callback("parses_total", "RSS解析次数（path: fast为流式快速解析）", "counter",
+                     lambda: {
+                         ("fast",): feed_manager.parser.fast_parses,
+                         ("full",): feed_manager.parser.parses - feed_manager.parser.fast_parses
+                     }, ("path",))
+    metrics.callback("refreshes_coalesced_total", "被合并到进行中刷新的请求数", "counter",
+                     lambda: feed_manager.get_fetch_stats()["coalesced"])
+    metrics.callback("feed_circuit_states", "各熔断状态的RSS源数量", "gauge",
+                     lambda: {(state,): count for state, count in
+                              feed_manager.get_health_stats()["states"].items()}, ("state",))
+    metrics.callback("store_articles", "文章存储中的文章数", "gauge",
+                     lambda: feed_manager.store.get_stats()["articles"])
+
+    @mcp.custom_route(config.metrics.path, methods=["GET"])
+    async def metrics_handler(request):
+        from starlette.responses import Response
+        return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+
+def _setup_profiling_routes(mcp: FastMCP, config: AppConfig, profiler: Profiler):
+    """设置性能分析管理路由，未配置管理令牌时不注册"""
+    token = os.getenv(config.profiling.token_env, "")
+    if not token:
+        return
+
+    def authorized(request) -> bool:
+        scheme, _, supplied = request.headers.get("authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(supplied.encode(), token.encode())
+
+    @mcp.custom_route("/debug/profile", methods=["GET"])
+    async def profile_handler(request):
+        from starlette.responses import PlainTextResponse, Response
+        if not authorized(request):
+            return PlainTextResponse("unauthorized\n", status_code=401)
+
+        format = request.query_params.get("format", Profiler.COLLAPSED)
+        try:
+            seconds = float(request.query_params.get("seconds", "10"))
+            interval = float(request.query_params.get("interval", "0.005"))
+            result = await profiler.cpu_profile(seconds, format, interval)
+        except ProfilerBusyError as e:
+            return PlainTextResponse(f"{e}\n", status_code=409)
+        except ValueError as e:
+            return PlainTextResponse(f"{e}\n", status_code=400)
+
+        if format == Profiler.PSTATS:
+            return Response(result, media_type="application/octet-stream", headers={
+                "Content-Disposition": 'attachment; filename="profile.pstats"'
+            })
+        return Response(result, media_type="text/plain; charset=utf-8")
+
+    @mcp.custom_route("/debug/memory", methods=["GET"])
+    async def memory_handler(request):
+        from starlette.responses import PlainTextResponse
+        if not authorized(request):
+            return PlainTextResponse("unauthorized\n", status_code=401)
+        if request.query_params.get("stop"):
+            return PlainTextResponse(profiler.memory.stop())
+        try:
+            frames = int(request.query_params.get("frames", "1"))
+            top = int(request.query_params.get("top", "30"))
+        except ValueError as e:
+            return PlainTextResponse(f"{e}\n", status_code=400)
+        return PlainTextResponse(profiler.memory.snapshot(frames, top))
+
+    @mcp.custom_route("/debug/tasks", methods=["GET"])
+    async def tasks_handler(request):
+        from starlette.responses import PlainTextResponse
+        if not authorized(request):
+            return PlainTextResponse("unauthorized\n", status_code=401)
+        return PlainTextResponse(format_tasks())
+
+    logger.info("性能分析管理路由已启用: /debug/profile, /debug/memory, /debug/tasks")
+
+
 def setup_logging(config: AppConfig):
     """设置日志配置"""
     logging.basicConfig(
@@ -141,3 +417,4 @@ def setup_logging(config: AppConfig):
     # 设置特定模块的日志级别
     logging.getLogger("feedparser").setLevel(logging.WARNING)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -4,15 +4,25 @@
 """
 
 import logging
+import random
 import time
-from typing import Set, List, Dict, Any, Optional
+from typing import Awaitable, Callable, Set, List, Dict, Any, Hashable, Optional, Tuple, Union
 from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult
 
 from ..config.settings import AppConfig
+from ..feeds.article import Article, to_dicts
 from ..feeds.manager import FeedManager
+from ..feeds.scheduler import FeedRefreshScheduler
+from ..metrics import get_metrics
+from .pagination import Cursor, InvalidCursorError, ResultSnapshots, decode_cursor, encode_cursor
+from .response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+# health_check的统计数据变化频繁，响应只缓存很短时间
+_HEALTH_CHECK_TTL = 1.0
+
 
 class ToolManager:
     """工具管理器"""
@@ -30,11 +40,19 @@ class ToolManager:
         'get_article_details': 'news',
     }
     
-    def __init__(self, config: AppConfig, feed_manager: FeedManager):
+    def __init__(self, config: AppConfig, feed_manager: FeedManager,
+                 scheduler: Optional[FeedRefreshScheduler] = None):
         self.config = config
         self.feed_manager = feed_manager
+        self.scheduler = scheduler
         self.tools_config = config.tools
         self.enabled_tools = self._get_enabled_tools()
+        self.responses = ResponseCache(
+            max_entries=config.cache.response_cache_size if config.cache.enabled else 0,
+            default_ttl=config.cache.duration
+        )
+        self.snapshots = ResultSnapshots(config.limits.cursor_snapshots)
+        self.metrics = get_metrics()
         
     def _get_enabled_tools(self) -> Set[str]:
         """获取启用的工具列表"""
@@ -74,6 +92,62 @@ class ToolManager:
         
         logger.info(f"工具注册完成，共注册 {len(self.enabled_tools)} 个工具")
     
+    def _cache_response(self, key: Hashable, generation: Optional[int], payload: Dict[str, Any],
+                        ttl: Optional[float] = None) -> Union[Dict[str, Any], CallToolResult]:
+        """
+        缓存工具响应
+
+        Args:
+            key: 缓存键
+            generation: 构建响应前的文章存储版本号，None表示与文章数据无关
+            payload: 工具返回的字典
+            ttl: 有效期（秒），默认使用缓存时间
+
+        Returns:
+            编码后的响应；构建期间文章存储发生变化时不缓存，直接返回字典
+        """
+        if generation is not None and generation != self.feed_manager.store.generation:
+            return payload
+        return self.responses.put(key, payload, ttl)
+
+    async def _paginate(self, tool: str, args: Dict[str, Any], page: Optional[Cursor], limit: int,
+                        compute: Callable[[], Awaitable[List[Article]]]) -> Tuple[List[Article], Optional[str], bool]:
+        """
+        取一页结果
+
+        首页重新计算完整结果，还有后续页时保存快照；后续页从游标记录的版本的快照中切片，不再重新计算。
+        快照已被淘汰时按当前数据重新计算，若数据版本已变化，结果可能与之前的页重复或遗漏。
+
+        Args:
+            tool: 工具名
+            args: 决定结果的工具参数（写入游标）
+            page: 解码后的游标，首页为None
+            limit: 每页数量
+            compute: 计算完整有序结果的函数
+
+        Returns:
+            (本页文章, 下一页游标（没有更多结果时为None）, 是否基于新版本的数据重新计算)
+        """
+        offset = page.offset if page is not None else 0
+        articles = None
+        if page is not None:
+            generation = page.generation
+            articles = self.snapshots.get(tool, args, generation)
+
+        stale = False
+        if articles is None:
+            articles = (await compute())[:self.config.limits.max_paginated_results]
+            current = self.feed_manager.store.generation
+            stale = page is not None and current != page.generation
+            generation = current
+            if offset + limit < len(articles):
+                self.snapshots.put(tool, args, generation, articles)
+
+        next_cursor = None
+        if offset + limit < len(articles):
+            next_cursor = encode_cursor(tool, args, generation, offset + limit, limit)
+        return articles[offset:offset + limit], next_cursor, stale
+
     def _get_tools_by_group(self, group: str) -> Set[str]:
         """获取指定分组中启用的工具"""
         group_tools = set()
@@ -87,12 +161,18 @@ class ToolManager:
         
         if 'health_check' in enabled_tools:
             @mcp.tool()
+            @self.metrics.observe_tool
             async def health_check() -> Dict[str, Any]:
                 """
                 检查新闻 MCP 服务器的健康状态和运行情况。
 
                 返回服务器状态信息，包括版本、可用源数量、缓存统计等。
                 """
+                key = self.responses.make_key("health_check")
+                cached = self.responses.get(key)
+                if cached is not None:
+                    return cached
+
                 try:
                     # 获取缓存统计
                     cache_stats = self.feed_manager.cache.get_stats()
@@ -105,7 +185,7 @@ class ToolManager:
                         len(feeds) for feeds in self.feed_manager.get_all_feeds().values()
                     )
                     
-                    return {
+                    return self._cache_response(key, None, {
                         "status": "healthy",
                         "version": self.config.server.version,
                         "server_name": self.config.server.name,
@@ -113,10 +193,22 @@ class ToolManager:
                         "categories_available": len(categories),
                         "cache_stats": {
                             "hits": cache_stats.get("hits", 0),
+                            "stale_hits": cache_stats.get("stale_hits", 0),
                             "misses": cache_stats.get("misses", 0),
+                            "disk_hits": cache_stats.get("disk_hits", 0),
+                            "shared_reloads": cache_stats.get("shared_reloads", 0),
+                            "evictions": cache_stats.get("evictions", 0),
                             "size": cache_stats.get("size", 0),
-                            "max_size": cache_stats.get("max_size", 0)
+                            "max_size": cache_stats.get("max_size", 0),
+                            "bytes": cache_stats.get("bytes", 0),
+                            "max_bytes": cache_stats.get("max_bytes", 0)
                         },
+                        "fetch_stats": self.feed_manager.get_fetch_stats(),
+                        "feed_health": self.feed_manager.get_health_stats(),
+                        "store_stats": self.feed_manager.get_store_stats(),
+                        "refresh_stats": self.scheduler.get_stats() if self.scheduler else {"running": False},
+                        "response_cache": self.responses.get_stats(),
+                        "pagination": self.snapshots.get_stats(),
                         "config": {
                             "cache_enabled": self.config.cache.enabled,
                             "cache_duration": self.config.cache.duration,
@@ -124,7 +216,7 @@ class ToolManager:
                             "default_limit": self.config.limits.default_article_limit
                         },
                         "enabled_tools": sorted(self.enabled_tools)
-                    }
+                    }, ttl=_HEALTH_CHECK_TTL)
                 except Exception as e:
                     logger.error(f"健康检查失败: {e}")
                     return {
@@ -136,12 +228,18 @@ class ToolManager:
         
         if 'list_available_feeds' in enabled_tools:
             @mcp.tool()
+            @self.metrics.observe_tool
             async def list_available_feeds() -> Dict[str, Any]:
                 """
                 列出所有可用的新闻源及其分类。
 
                 返回所有配置的RSS新闻源信息，按分类组织。
                 """
+                key = self.responses.make_key("list_available_feeds")
+                cached = self.responses.get(key)
+                if cached is not None:
+                    return cached
+
                 try:
                     all_feeds = self.feed_manager.get_all_feeds()
                     categories = self.feed_manager.get_available_categories()
@@ -161,7 +259,8 @@ class ToolManager:
                         ]
                         total_feeds += len(feeds)
                     
-                    return {
+                    # 配置只在启动时加载，源列表在进程生命周期内不变
+                    return self._cache_response(key, None, {
                         "total_feeds": total_feeds,
                         "total_categories": len(categories),
                         "categories": list(categories),
@@ -171,7 +270,7 @@ class ToolManager:
                             "max_articles_per_feed": self.config.feeds.max_articles,
                             "default_limit": self.config.feeds.default_limit
                         }
-                    }
+                    }, ttl=float("inf"))
                 except Exception as e:
                     logger.error(f"获取RSS源列表失败: {e}")
                     return {
@@ -187,52 +286,96 @@ class ToolManager:
         
         if 'get_latest_news' in enabled_tools:
             @mcp.tool()
-            async def get_latest_news(category: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+            @self.metrics.observe_tool
+            async def get_latest_news(category: Optional[str] = None, limit: Optional[int] = None,
+                                      seed: Optional[int] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
                 """
                 从 RSS 源获取最新新闻文章。
 
                 参数:
                     category (str, 可选): 新闻分类过滤，可选值: tech, general, business, science, travel, politics
-                    limit (int, 可选): 返回文章数量限制，默认5条，最大20条
+                    limit (int, 可选): 每页文章数量，默认5条，最大20条
+                    seed (int, 可选): 随机种子，指定后相同数据下返回相同的文章组合
+                    cursor (str, 可选): 上一页返回的 next_cursor，用于获取下一页（分类和种子沿用上一页）
 
                 返回:
-                    包含文章列表、总数、分类和时间戳的字典
+                    包含文章列表、总数、分类、下一页游标和时间戳的字典
                 """
                 try:
                     logger.info(f"get_latest_news 开始执行，category={category}, limit={limit}")
 
+                    page = None
+                    if cursor:
+                        page = decode_cursor(cursor, "get_latest_news")
+                        category = page.args.get("category")
+                        seed = page.args.get("seed")
+                        if limit is None:
+                            limit = page.limit
+
                     # 使用配置的默认限制
                     if limit is None:
                         limit = self.config.limits.default_article_limit
 
-                    # 限制最大文章数量
-                    limit = min(limit, self.config.limits.max_articles_per_feed)
+                    # 文章数量限制在1到最大值之间（0或负数会产生空页和原地翻页的游标）
+                    limit = max(1, min(limit, self.config.limits.max_articles_per_feed))
 
                     logger.info(f"处理后的参数：category={category}, limit={limit}")
 
-                    # 获取文章 - 使用平衡获取方法，每个源随机取1-2条
-                    if category:
-                        logger.info(f"按分类获取文章：{category}（平衡模式：每个源随机1-2条）")
-                        articles = await self.feed_manager.fetch_feeds_by_category_balanced(
-                            category=category,
-                            limit=limit
-                        )
-                    else:
-                        logger.info("获取所有文章（平衡模式：每个源随机1-2条）")
-                        articles = await self.feed_manager.fetch_all_feeds_balanced(
-                            limit=limit
+                    # 未指定种子时每次随机选择，结果不缓存
+                    key = None
+                    generation = self.feed_manager.store.generation
+                    if seed is not None and page is None:
+                        key = self.responses.make_key(
+                            "get_latest_news", generation, category=category, limit=limit, seed=seed
                         )
+                        # 有RSS源需要刷新时不使用缓存的响应，通过平衡获取触发刷新
+                        cached = self.responses.get(key, fresh=self.feed_manager.balanced_feeds_fresh(category))
+                        if cached is not None:
+                            return cached
+
+                    # 未指定种子时生成一个写入游标，快照被淘汰后后续页仍能按同样的选取重新计算
+                    sample_seed = seed if seed is not None else random.randrange(2 ** 31)
+
+                    # 获取文章 - 使用平衡选取，每个源按配额随机取少量文章（见feeds.yaml的sampling）
+                    async def compute() -> List[Article]:
+                        if category:
+                            logger.info(f"按分类获取文章：{category}（平衡模式）")
+                            return await self.feed_manager.fetch_feeds_by_category_balanced(
+                                category=category,
+                                seed=sample_seed
+                            )
+                        logger.info("获取所有文章（平衡模式）")
+                        return await self.feed_manager.fetch_all_feeds_balanced(seed=sample_seed)
+
+                    articles, next_cursor, stale = await self._paginate(
+                        "get_latest_news", {"category": category, "seed": sample_seed}, page, limit, compute
+                    )
 
                     logger.info(f"成功获取 {len(articles)} 篇文章")
                     
-                    return {
-                        "articles": articles,
+                    payload = {
+                        "articles": to_dicts(articles),
                         "total_count": len(articles),
                         "category": category or "all",
                         "limit": limit,
+                        "next_cursor": next_cursor,
                         "timestamp": time.time()
                     }
+                    if stale:
+                        payload["cursor_stale"] = True
+                    # 源全部不可用时的空结果不缓存，下次调用重新尝试
+                    if key is None or not articles:
+                        return payload
+                    return self._cache_response(key, generation, payload)
                     
+                except InvalidCursorError as e:
+                    return {
+                        "error": str(e),
+                        "articles": [],
+                        "total_count": 0,
+                        "category": category or "all",
+                        "limit": limit or self.config.limits.default_article_limit
+                    }
                 except Exception as e:
                     logger.error(f"获取最新新闻失败: {e}")
                     return {
@@ -245,18 +388,28 @@ class ToolManager:
         
         if 'search_news' in enabled_tools:
             @mcp.tool()
-            async def search_news(query: str, limit: Optional[int] = None) -> Dict[str, Any]:
+            @self.metrics.observe_tool
+            async def search_news(query: str = "", limit: Optional[int] = None,
+                                  cursor: Optional[str] = None) -> Dict[str, Any]:
                 """
-                在新闻文章中搜索匹配查询的内容。
+                在新闻文章中搜索匹配查询的内容，结果按相关度排序。
 
                 参数:
-                    query (str, 必需): 搜索关键词，不能为空
-                    limit (int, 可选): 返回结果数量限制，默认5条，最大50条
+                    query (str, 必需): 搜索关键词，不能为空（使用cursor翻页时可省略）；多个关键词需同时命中，用双引号括起可按短语匹配
+                    limit (int, 可选): 每页结果数量，默认5条，最大50条
+                    cursor (str, 可选): 上一页返回的 next_cursor，用于获取下一页（查询词沿用上一页）
 
                 返回:
-                    包含匹配文章列表、总数、查询词和时间戳的字典
+                    包含匹配文章列表、总数、查询词、下一页游标和时间戳的字典
                 """
                 try:
+                    page = None
+                    if cursor:
+                        page = decode_cursor(cursor, "search_news")
+                        query = page.args.get("query", "")
+                        if limit is None:
+                            limit = page.limit
+
                     if not query or not query.strip():
                         return {
                             "error": "搜索查询不能为空",
@@ -270,28 +423,57 @@ class ToolManager:
                     if limit is None:
                         limit = self.config.limits.default_article_limit
                     
-                    # 限制最大搜索结果数量
-                    limit = min(limit, self.config.limits.max_search_results)
-                    
-                    # 先获取所有文章，然后搜索
-                    all_articles = await self.feed_manager.fetch_all_feeds()
-                    articles = self.feed_manager.search_articles(
-                        articles=all_articles,
-                        query=query.strip()
+                    # 搜索结果数量限制在1到最大值之间（0或负数会产生空页和原地翻页的游标）
+                    limit = max(1, min(limit, self.config.limits.max_search_results))
+                    query = query.strip()
+
+                    # 有RSS源需要刷新时不使用缓存的响应，通过load_all_feeds触发刷新
+                    if page is None:
+                        key = self.responses.make_key(
+                            "search_news", self.feed_manager.store.generation, query=query, limit=limit
+                        )
+                        cached = self.responses.get(key, fresh=self.feed_manager.feeds_fresh())
+                        if cached is not None:
+                            return cached
+
+                    # 确保文章已加载，然后通过倒排索引搜索（翻页时直接使用首页保存的快照）
+                    async def compute() -> List[Article]:
+                        await self.feed_manager.load_all_feeds()
+                        return self.feed_manager.search_articles(
+                            query=query,
+                            limit=self.config.limits.max_paginated_results
+                        )
+
+                    articles, next_cursor, stale = await self._paginate(
+                        "search_news", {"query": query}, page, limit, compute
                     )
 
-                    # 限制结果数量
-                    if limit:
-                        articles = articles[:limit]
-                    
-                    return {
-                        "articles": articles,
+                    payload = {
+                        "articles": to_dicts(articles),
                         "total_count": len(articles),
-                        "query": query.strip(),
+                        "query": query,
                         "limit": limit,
+                        "next_cursor": next_cursor,
                         "timestamp": time.time()
                     }
+                    if stale:
+                        payload["cursor_stale"] = True
+                    if page is not None:
+                        return payload
+
+                    # 加载期间文章存储可能已更新，按加载后的版本号缓存
+                    generation = self.feed_manager.store.generation
+                    key = self.responses.make_key("search_news", generation, query=query, limit=limit)
+                    return self._cache_response(key, generation, payload)
                     
+                except InvalidCursorError as e:
+                    return {
+                        "error": str(e),
+                        "articles": [],
+                        "total_count": 0,
+                        "query": query,
+                        "limit": limit or self.config.limits.default_article_limit
+                    }
                 except Exception as e:
                     logger.error(f"搜索新闻失败: {e}")
                     return {
@@ -304,18 +486,28 @@ class ToolManager:
         
         if 'get_feed_content' in enabled_tools:
             @mcp.tool()
-            async def get_feed_content(feed_name: str, limit: Optional[int] = None) -> Dict[str, Any]:
+            @self.metrics.observe_tool
+            async def get_feed_content(feed_name: str = "", limit: Optional[int] = None,
+                                       cursor: Optional[str] = None) -> Dict[str, Any]:
                 """
                 获取特定新闻源的文章内容。
 
                 参数:
-                    feed_name (str, 必需): 新闻源名称，不能为空
-                    limit (int, 可选): 返回文章数量限制，默认5条，最大20条
+                    feed_name (str, 必需): 新闻源名称，不能为空（使用cursor翻页时可省略）
+                    limit (int, 可选): 每页文章数量，默认5条，最大20条
+                    cursor (str, 可选): 上一页返回的 next_cursor，用于获取下一页（新闻源沿用上一页）
 
                 返回:
-                    包含指定源的文章列表、总数、源名称和时间戳的字典
+                    包含指定源的文章列表、总数、源名称、下一页游标和时间戳的字典
                 """
                 try:
+                    page = None
+                    if cursor:
+                        page = decode_cursor(cursor, "get_feed_content")
+                        feed_name = page.args.get("feed_name", "")
+                        if limit is None:
+                            limit = page.limit
+
                     if not feed_name or not feed_name.strip():
                         return {
                             "error": "新闻源名称不能为空",
@@ -329,8 +521,8 @@ class ToolManager:
                     if limit is None:
                         limit = self.config.limits.default_article_limit
                     
-                    # 限制最大文章数量
-                    limit = min(limit, self.config.limits.max_articles_per_feed)
+                    # 文章数量限制在1到最大值之间（0或负数会产生空页和原地翻页的游标）
+                    limit = max(1, min(limit, self.config.limits.max_articles_per_feed))
                     
                     # 查找指定的RSS源
                     feed_source = None
@@ -352,20 +544,44 @@ class ToolManager:
                             ]
                         }
 
+                    generation = self.feed_manager.store.generation
+                    key = self.responses.make_key(
+                        "get_feed_content", generation, feed_name=feed_source.name, limit=limit
+                    )
+                    # 源需要刷新时不使用缓存的响应，通过fetch_feed触发后台刷新或重新获取
+                    if page is None:
+                        cached = self.responses.get(key, fresh=self.feed_manager.feeds_fresh([feed_source]))
+                        if cached is not None:
+                            return cached
+
                     # 获取特定源的文章
-                    articles = await self.feed_manager.fetch_feed(
-                        feed_source=feed_source,
-                        limit=limit
+                    articles, next_cursor, stale = await self._paginate(
+                        "get_feed_content", {"feed_name": feed_source.name}, page, limit,
+                        lambda: self.feed_manager.fetch_feed(feed_source=feed_source)
                     )
                     
-                    return {
-                        "articles": articles,
+                    payload = {
+                        "articles": to_dicts(articles),
                         "total_count": len(articles),
                         "feed_name": feed_name.strip(),
                         "limit": limit,
+                        "next_cursor": next_cursor,
                         "timestamp": time.time()
                     }
+                    if stale:
+                        payload["cursor_stale"] = True
+                    if page is not None or not articles:
+                        return payload
+                    return self._cache_response(key, generation, payload)
                     
+                except InvalidCursorError as e:
+                    return {
+                        "error": str(e),
+                        "articles": [],
+                        "total_count": 0,
+                        "feed_name": feed_name,
+                        "limit": limit or self.config.limits.default_article_limit
+                    }
                 except Exception as e:
                     logger.error(f"获取新闻源内容失败: {e}")
                     return {
@@ -378,6 +594,7 @@ class ToolManager:
         
         if 'get_article_details' in enabled_tools:
             @mcp.tool()
+            @self.metrics.observe_tool
             async def get_article_details(url: str) -> Dict[str, Any]:
                 """
                 通过URL获取文章的详细信息。
@@ -395,16 +612,22 @@ class ToolManager:
                             "url": url
                         }
                     
+                    generation = self.feed_manager.store.generation
+                    key = self.responses.make_key("get_article_details", generation, url=url.strip())
+                    cached = self.responses.get(key)
+                    if cached is not None:
+                        return cached
+
                     # 获取文章详情
                     article = await self.feed_manager.get_article_details(url.strip())
 
                     if article:
-                        return {
-                            "article": article,
+                        return self._cache_response(key, generation, {
+                            "article": article.to_dict(),
                             "url": url.strip(),
                             "found": True,
                             "timestamp": time.time()
-                        }
+                        })
                     else:
                         return {
                             "error": "未找到指定URL的文章",
@@ -0,0 +1,149 @@
+"""
+分页模块
+工具结果的不透明游标，以及按数据版本保存的结果快照，翻页时只切片而不重新计算
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional
+
+from ..feeds.article import Article
+
+
+class InvalidCursorError(ValueError):
+    """游标无法解析或不属于当前工具"""
+    pass
+
+
+class Cursor(NamedTuple):
+    """解码后的游标"""
+    args: Dict[str, Any]  # 生成结果所用的工具参数
+    generation: int  # 生成结果时的文章存储版本号
+    offset: int  # 下一页在结果中的起始位置
+    limit: int  # 每页数量
+
+
+def encode_cursor(tool: str, args: Dict[str, Any], generation: int, offset: int, limit: int) -> str:
+    """
+    编码游标
+
+    Args:
+        tool: 工具名
+        args: 生成结果所用的工具参数（JSON可序列化）
+        generation: 生成结果时的文章存储版本号
+        offset: 下一页在结果中的起始位置
+        limit: 每页数量
+
+    Returns:
+        URL安全的游标字符串
+    """
+    data = json.dumps([tool, args, generation, offset, limit], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, tool: str) -> Cursor:
+    """
+    解码游标
+
+    Args:
+        cursor: 游标字符串
+        tool: 当前工具名
+
+    Returns:
+        解码后的游标
+
+    Raises:
+        InvalidCursorError: 游标无法解析或由其他工具生成
+    """
+    try:
+        padded = cursor.strip() + "=" * (-len(cursor.strip()) % 4)
+        name, args, generation, offset, limit = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError(f"无效的分页游标: {e}") from e
+
+    if name != tool:
+        raise InvalidCursorError(f"分页游标属于工具 {name}，不能用于 {tool}")
+    if not isinstance(args, dict) or not all(isinstance(v, int) and v >= 0 for v in (generation, offset)) \
+            or not isinstance(limit, int) or limit < 1:
+        raise InvalidCursorError("无效的分页游标")
+    return Cursor(args, generation, offset, limit)
+
+
+class ResultSnapshots:
+    """
+    结果快照缓存
+
+    按 (工具名, 参数, 文章存储版本号) 保存完整的有序结果（文章对象引用），
+    后续页直接从快照切片；数据更新后快照仍保持翻页期间结果不变，按LRU淘汰。
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """
+        初始化快照缓存
+
+        Args:
+            max_entries: 最大快照数，0表示不保存（每页重新计算）
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, List[Article]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(tool: str, args: Dict[str, Any], generation: int) -> Hashable:
+        return (tool, tuple(sorted(args.items())), generation)
+
+    def get(self, tool: str, args: Dict[str, Any], generation: int) -> Optional[List[Article]]:
+        """
+        获取快照
+
+        Args:
+            tool: 工具名
+            args: 工具参数
+            generation: 文章存储版本号
+
+        Returns:
+            有序结果，不存在时返回None
+        """
+        key = self._key(tool, args, generation)
+        articles = self._entries.get(key)
+        if articles is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return articles
+
+    def put(self, tool: str, args: Dict[str, Any], generation: int, articles: List[Article]) -> None:
+        """
+        保存快照
+
+        Args:
+            tool: 工具名
+            args: 工具参数
+            generation: 文章存储版本号
+            articles: 有序结果
+        """
+        if self.max_entries <= 0:
+            return
+        key = self._key(tool, args, generation)
+        self._entries[key] = articles
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取统计信息
+
+        Returns:
+            快照数和命中统计
+        """
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,144 @@
+"""
+工具响应缓存模块
+按 (工具名, 规范化参数, 数据版本) 缓存已编码的工具响应
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import pydantic_core
+from mcp.types import CallToolResult, TextContent
+
+
+# 编码时代替timestamp字段值的占位符，命中时替换为当前时间
+_TIMESTAMP_PLACEHOLDER = "__response_timestamp__"
+_TIMESTAMP_TOKEN = json.dumps(_TIMESTAMP_PLACEHOLDER)
+
+
+class ResponseCache:
+    """
+    工具响应缓存
+
+    保存已序列化的JSON文本（与FastMCP对字典返回值的编码方式一致）和结构化内容，
+    命中时直接返回CallToolResult，不再重新构建和序列化；响应中的timestamp字段在每次命中时填入当前时间。
+    键中包含文章存储的版本号，数据变化后旧条目不再命中，按LRU淘汰。
+    """
+
+    def __init__(self, max_entries: int = 256, default_ttl: Optional[float] = None):
+        """
+        初始化响应缓存
+
+        Args:
+            max_entries: 最大条目数，0表示禁用
+            default_ttl: 默认有效期（秒），None表示只随版本号失效
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        # 键 -> (编码后的响应, 过期时间, 以timestamp占位符切分的JSON文本（没有timestamp字段时为None）)
+        self._entries: "OrderedDict[Hashable, Tuple[CallToolResult, Optional[float], Optional[List[str]]]]" = \
+            OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0  # 因数据需要刷新而未使用缓存的次数（包含在misses中）
+
+    def make_key(self, tool: str, generation: Any = None, **args: Any) -> Hashable:
+        """
+        生成缓存键
+
+        Args:
+            tool: 工具名
+            generation: 数据版本号（如文章存储的generation），None表示与数据无关
+            **args: 规范化后的工具参数
+
+        Returns:
+            缓存键
+        """
+        return (tool, tuple(sorted(args.items())), generation)
+
+    def get(self, key: Hashable, fresh: bool = True) -> Optional[CallToolResult]:
+        """
+        获取缓存的响应
+
+        Args:
+            key: 缓存键
+            fresh: 响应依赖的数据是否无需刷新，False时不使用缓存（计为未命中）
+
+        Returns:
+            缓存的响应，未命中或已过期时返回None
+        """
+        if not fresh:
+            self.misses += 1
+            self.bypasses += 1
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        result, expires_at, parts = entry
+        now = time.time()
+        if expires_at is not None and now >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if parts is None:
+            return result
+        return CallToolResult(
+            content=[TextContent(type="text", text=json.dumps(now).join(parts))],
+            structuredContent={"result": {**result.structuredContent["result"], "timestamp": now}}
+        )
+
+    def put(self, key: Hashable, payload: Dict[str, Any], ttl: Optional[float] = None) -> CallToolResult:
+        """
+        编码并缓存响应
+
+        Args:
+            key: 缓存键
+            payload: 工具返回的字典
+            ttl: 有效期（秒），默认使用default_ttl
+
+        Returns:
+            编码后的响应
+        """
+        parts = None
+        if "timestamp" in payload and self.max_entries > 0:
+            parts = self._encode({**payload, "timestamp": _TIMESTAMP_PLACEHOLDER}).split(_TIMESTAMP_TOKEN)
+            if len(parts) != 2:
+                # 内容中恰好出现占位符时不替换，命中时返回构建时的时间
+                parts = None
+
+        text = json.dumps(payload["timestamp"]).join(parts) if parts is not None else self._encode(payload)
+        result = CallToolResult(
+            content=[TextContent(type="text", text=text)],
+            # 与FastMCP对Dict[str, Any]返回值的结构化输出一致（包装在result字段中）
+            structuredContent={"result": payload}
+        )
+        if self.max_entries <= 0:
+            return result
+
+        ttl = self.default_ttl if ttl is None else ttl
+        self._entries[key] = (result, time.time() + ttl if ttl is not None else None, parts)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _encode(payload: Dict[str, Any]) -> str:
+        return pydantic_core.to_json(payload, fallback=str, indent=2).decode()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取响应缓存统计信息"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "size": len(self._entries),
+            "max_entries": self.max_entries
+        }
@@ -0,0 +1,204 @@
+"""
+多进程模块
+预派生多个HTTP工作进程（SO_REUSEPORT），并通过文件锁选举唯一的后台刷新进程
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class RefresherElection:
+    """
+    后台刷新进程选举
+
+    各工作进程尝试对同一个锁文件加排他锁（flock），持有锁的进程负责刷新RSS源并写入共享的磁盘缓存，
+    其他进程只从磁盘缓存读取。持有者退出时锁由内核释放，其他进程在下一次尝试时接替。
+    """
+
+    def __init__(self, lock_path: str, interval: float = 15):
+        """
+        初始化选举
+
+        Args:
+            lock_path: 锁文件路径
+            interval: 未当选时重新尝试的间隔（秒）
+        """
+        self.lock_path = Path(lock_path)
+        self.interval = interval
+        self.is_leader = False
+        self.has_leader = False  # 是否已确认由其他进程持有锁（本进程只从共享磁盘缓存读取）
+        self._file = None
+        self._task: Optional[asyncio.Task] = None
+
+    def try_acquire(self) -> bool:
+        """
+        尝试成为刷新进程
+
+        Returns:
+            是否持有锁
+        """
+        if self.is_leader:
+            return True
+        if fcntl is None:
+            # 不支持flock的平台上没有多进程模式，直接当选
+            self.is_leader = True
+            return True
+
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        file = open(self.lock_path, "a+")
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            file.close()
+            self.has_leader = True
+            return False
+
+        file.seek(0)
+        file.truncate()
+        file.write(f"{os.getpid()}\n")
+        file.flush()
+        self._file = file
+        self.is_leader = True
+        self.has_leader = False
+        return True
+
+    def start(self, on_elected: Callable[[], None]) -> None:
+        """
+        在后台参与选举，当选后调用on_elected（可重复调用）
+
+        Args:
+            on_elected: 当选时的回调，如启动后台刷新调度器
+        """
+        if self.is_leader or (self._task is not None and not self._task.done()):
+            return
+        # 立即尝试一次，首个请求处理前即可确定本进程是否由其他进程负责刷新
+        if self.try_acquire():
+            self._elected(on_elected)
+            return
+        self._task = asyncio.ensure_future(self._campaign(on_elected))
+
+    async def _campaign(self, on_elected: Callable[[], None]) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.try_acquire():
+                self._elected(on_elected)
+                return
+
+    @staticmethod
+    def _elected(on_elected: Callable[[], None]) -> None:
+        logger.info(f"工作进程 {os.getpid()} 当选为后台刷新进程")
+        on_elected()
+
+    def release(self) -> None:
+        """释放锁"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.is_leader = False
+
+
+def bind_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    """
+    创建监听套接字
+
+    Args:
+        host: 监听地址
+        port: 监听端口
+        reuse_port: 是否设置SO_REUSEPORT（每个工作进程绑定自己的套接字，由内核分配连接）
+
+    Returns:
+        已绑定的套接字
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_workers(count: int, host: str, port: int,
+                serve: Callable[[socket.socket], None]) -> None:
+    """
+    预派生count个工作进程并监督运行，异常退出的进程会被重新启动
+
+    父进程只负责派生和转发信号，不创建事件循环和任何后台线程。
+    支持SO_REUSEPORT时每个工作进程绑定自己的套接字，否则共享父进程绑定的套接字。
+
+    Args:
+        count: 工作进程数
+        host: 监听地址
+        port: 监听端口
+        serve: 在工作进程中运行服务器的函数，参数为监听套接字
+    """
+    reuse_port = hasattr(socket, "SO_REUSEPORT")
+    shared = None if reuse_port else bind_socket(host, port, reuse_port=False)
+    children: Dict[int, int] = {}
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                serve(shared or bind_socket(host, port, reuse_port=True))
+            except BaseException:
+                logger.exception(f"工作进程 {os.getpid()} 异常退出")
+                code = 1
+            finally:
+                logging.shutdown()
+                os._exit(code)
+        children[pid] = index
+        logger.info(f"工作进程 #{index} 已启动 (pid {pid})")
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for index in range(count):
+        spawn(index)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is None or stopping:
+            continue
+        logger.warning(f"工作进程 #{index} (pid {pid}) 退出，状态 {status}，1秒后重启")
+        time.sleep(1)
+        if not stopping:
+            spawn(index)
+
+    if shared is not None:
+        shared.close()
+    logger.info("所有工作进程已退出")